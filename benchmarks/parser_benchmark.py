@@ -0,0 +1,138 @@
+"""
+Measures per-resource parsing cost for posted resources with attributes and relationships.
+
+Run from the repository root with `python -m benchmarks.parser_benchmark`.
+"""
+import json
+import timeit
+
+from cartographer.field_types import StringAttribute, IntAttribute, BoolAttribute, DateAttribute, \
+    SchemaRelationship, ArrayRelationship
+from cartographer.parsers.jsonapi_parser import PostedDocument
+from cartographer.parsers.lazy_jsonapi_parser import LazyPostedDocument
+from cartographer.parsers.schema_parser import SchemaParser
+from cartographer.schemas.schema import Schema
+
+RESOURCE_COUNT = 500
+INCLUDED_COUNT = 50
+REPEATS = 5
+
+
+class BenchmarkPostSchema(Schema):
+    SCHEMA = {
+        'type': 'benchmark-post',
+        'id': StringAttribute().read_from(model_property='post_id').self_explanatory(),
+        'attributes': {
+            'title': StringAttribute().read_from(model_property='title').self_explanatory(),
+            'body': StringAttribute().read_from(model_property='body').self_explanatory(),
+            'like_count': IntAttribute().read_from(model_property='like_count').self_explanatory().computed(),
+            'is_paid': BoolAttribute().read_from(model_property='is_paid').self_explanatory(),
+            'published_at': DateAttribute().read_from(model_property='published_at').self_explanatory(),
+        },
+        'relationships': {
+            'author': SchemaRelationship(model_type='benchmark-author', id_attribute='author_id'),
+            'tags': ArrayRelationship(model_type='benchmark-tag'),
+        }
+    }
+
+
+class BenchmarkPostParser(SchemaParser):
+    @classmethod
+    def schema(cls):
+        return BenchmarkPostSchema
+
+
+class PerKeyPostParser(BenchmarkPostParser):
+    """The baseline: overriding a per-key method makes `table_data` call the per-key methods instead of the plan"""
+
+    def should_parse_attribute(self, key):
+        return super().should_parse_attribute(key)
+
+
+def make_posted_documents():
+    return [
+        {
+            'data': {
+                'type': 'benchmark-post',
+                'attributes': {
+                    'title': 'Post {}'.format(post_id),
+                    'body': 'Body of post {}'.format(post_id),
+                    'like_count': post_id * 3,
+                    'is_paid': post_id % 2 == 0,
+                    'published_at': '2017-03-{:02d}T12:00:00+00:00'.format(post_id % 28 + 1),
+                    'unknown': True,
+                },
+                'relationships': {
+                    'author': {'data': {'type': 'benchmark-author', 'id': str(post_id % 3)}},
+                    'tags': {'data': [{'type': 'benchmark-tag', 'id': str(tag_id)} for tag_id in range(3)]},
+                }
+            }
+        }
+        for post_id in range(RESOURCE_COUNT)
+    ]
+
+
+def make_compound_bodies(included_first=False):
+    """
+    Encoded posts which each carry many included resources, as a client-side bulk editor might send
+
+    :param included_first: Whether `included` comes before `data`, so that reading `data` has to skip over it
+    """
+    bodies = []
+    for document in make_posted_documents():
+        included = [
+            {'type': 'benchmark-tag', 'id': str(tag_id), 'attributes': {'name': 'Tag {}'.format(tag_id)}}
+            for tag_id in range(INCLUDED_COUNT)
+        ]
+        document = dict(included=included, **document) if included_first else dict(document, included=included)
+        bodies.append(json.dumps(document).encode('utf-8'))
+    return bodies
+
+
+def per_resource_microseconds(statement):
+    best = min(timeit.repeat(statement, number=1, repeat=REPEATS))
+    return best / RESOURCE_COUNT * 1e6
+
+
+def run():
+    documents = make_posted_documents()
+
+    def table_data(parser_class):
+        def statement():
+            for document in documents:
+                parser_class(document, current_user_id=1).table_data()
+        return statement
+
+    bodies = make_compound_bodies()
+
+    def route_eagerly():
+        for body in bodies:
+            PostedDocument(json.loads(body.decode('utf-8'))).data().resource_type()
+
+    def route_lazily():
+        for body in bodies:
+            LazyPostedDocument(body).data().resource_type()
+
+    included_first_bodies = make_compound_bodies(included_first=True)
+
+    def route_eagerly_past_included():
+        for body in included_first_bodies:
+            PostedDocument(json.loads(body.decode('utf-8'))).data().resource_type()
+
+    def route_lazily_past_included():
+        for body in included_first_bodies:
+            LazyPostedDocument(body).data().resource_type()
+
+    print('table_data, per key:    {:8.2f} us/resource'.format(per_resource_microseconds(table_data(PerKeyPostParser))))
+    print('table_data:             {:8.2f} us/resource'.format(
+        per_resource_microseconds(table_data(BenchmarkPostParser))))
+    print('read type, eager:       {:8.2f} us/document'.format(per_resource_microseconds(route_eagerly)))
+    print('read type, lazy:        {:8.2f} us/document'.format(per_resource_microseconds(route_lazily)))
+    print('read type after included, eager: {:8.2f} us/document'.format(
+        per_resource_microseconds(route_eagerly_past_included)))
+    print('read type after included, lazy:  {:8.2f} us/document'.format(
+        per_resource_microseconds(route_lazily_past_included)))
+
+
+if __name__ == '__main__':
+    run()
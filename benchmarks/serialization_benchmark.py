@@ -0,0 +1,181 @@
+"""
+Measures per-resource serialization cost for a feed-shaped collection.
+
+Run from the repository root with `python -m benchmarks.serialization_benchmark`.
+"""
+import timeit
+
+from cartographer.field_types import StringAttribute, IntAttribute, BoolAttribute, SchemaRelationship
+from cartographer.resources import get_resource_registry_container
+from cartographer.schemas.schema import Schema
+from cartographer.serializers import SchemaSerializer, JSONAPICollectionSerializer
+from cartographer.utils.version import JSONAPIVersion
+
+RESOURCE_COUNT = 500
+REPEATS = 5
+
+
+class BenchmarkAuthor(object):
+    def __init__(self, author_id):
+        self.author_id = author_id
+        self.name = 'Author {}'.format(author_id)
+
+
+class BenchmarkPost(object):
+    def __init__(self, post_id, author_id):
+        self.post_id = post_id
+        self.author_id = author_id
+        self.title = 'Post {}'.format(post_id)
+        self.body = 'Body of post {}'.format(post_id)
+        self.like_count = post_id * 3
+        self.comment_count = post_id * 2
+        self.is_paid = post_id % 2 == 0
+        self.is_public = True
+
+    def url(self):
+        return '/posts/{}'.format(self.post_id)
+
+
+class BenchmarkAuthorSchema(Schema):
+    SCHEMA = {
+        'type': 'benchmark-author',
+        'id': StringAttribute().read_from(model_property='author_id').self_explanatory(),
+        'attributes': {
+            'name': StringAttribute().read_from(model_property='name').self_explanatory(),
+        }
+    }
+
+
+class BenchmarkPostSchema(Schema):
+    SCHEMA = {
+        'type': 'benchmark-post',
+        'id': StringAttribute().read_from(model_property='post_id').self_explanatory(),
+        'attributes': {
+            'title': StringAttribute().read_from(model_property='title').self_explanatory(),
+            'body': StringAttribute().read_from(model_property='body').self_explanatory(),
+            'like_count': IntAttribute().read_from(model_property='like_count').self_explanatory(),
+            'comment_count': IntAttribute().read_from(model_property='comment_count').self_explanatory(),
+            'is_paid': BoolAttribute().read_from(model_property='is_paid').self_explanatory(),
+            'is_public': BoolAttribute().read_from(model_property='is_public').self_explanatory(),
+            'url': StringAttribute().read_from(model_method='url').self_explanatory(),
+        },
+        'relationships': {
+            'author': SchemaRelationship(model_type='benchmark-author', id_attribute='author_id'),
+        }
+    }
+
+
+class BenchmarkAuthorSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return BenchmarkAuthorSchema
+
+
+class BenchmarkPostSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return BenchmarkPostSchema
+
+
+class UnplannedPostSerializer(BenchmarkPostSerializer):
+    """The baseline: walks the schema on every call, as `SchemaSerializer` did before `SerializationPlan`"""
+
+    def resource_id(self):
+        return self.schema().resource_id().to_json(self)
+
+    def attributes_dictionary(self):
+        result = {}
+        for key in self.schema().attributes():
+            if self.should_include_attribute(key):
+                result[key] = self.schema().attribute(key).to_json(self)
+        return result
+
+    def should_include_attribute(self, key):
+        if self.requested_fields is not None and self.resource_type() in self.requested_fields:
+            if key not in self.requested_fields[self.resource_type()]:
+                return False
+        elif key not in self.default_fields():
+            return False
+        if self._masked_fields is None:
+            self._masked_fields = self.mask_class().fields_cant_view(self.model, self.current_user_id)
+        return key not in self._masked_fields
+
+    def linked_resources(self):
+        if self._linked_resources is None:
+            self._linked_resources = {
+                key: self.schema().relationship(key).related_serializer(self, key)
+                for key in self.schema().relationships()
+                if self.should_include_relationship(key)
+            }
+        return self._linked_resources
+
+
+AUTHORS = {author_id: BenchmarkAuthor(author_id) for author_id in range(3)}
+
+
+def register_benchmark_resources():
+    registry = get_resource_registry_container()
+    registry.register_resource(
+        type_string='benchmark-author',
+        schema=BenchmarkAuthorSchema,
+        serializer=BenchmarkAuthorSerializer,
+        model=BenchmarkAuthor,
+        model_get=AUTHORS.get,
+    )
+    registry.register_resource(
+        type_string='benchmark-post',
+        schema=BenchmarkPostSchema,
+        serializer=BenchmarkPostSerializer,
+        model=BenchmarkPost,
+    )
+    registry.freeze()
+
+
+def make_posts():
+    return [BenchmarkPost(post_id, post_id % len(AUTHORS)) for post_id in range(RESOURCE_COUNT)]
+
+
+def per_resource_microseconds(statement):
+    best = min(timeit.repeat(statement, number=1, repeat=REPEATS))
+    return best / RESOURCE_COUNT * 1e6
+
+
+def run():
+    register_benchmark_resources()
+    posts = make_posts()
+
+    def attributes_only(serializer_class):
+        serializers = [serializer_class(post, includes=[]) for post in posts]
+
+        def statement():
+            for serializer in serializers:
+                serializer.attributes_dictionary()
+        return statement
+
+    def full_document(serializer_class):
+        def statement():
+            JSONAPICollectionSerializer([
+                serializer_class(post, includes=['author'])
+                for post in posts
+            ]).as_json_api_document(JSONAPIVersion.JSONAPI_1_0)
+        return statement
+
+    def encoded_document():
+        JSONAPICollectionSerializer([
+            BenchmarkPostSerializer(post, includes=['author'])
+            for post in posts
+        ]).as_json_api_bytes(JSONAPIVersion.JSONAPI_1_0)
+
+    print('attributes_dictionary, unplanned: {:8.2f} us/resource'.format(
+        per_resource_microseconds(attributes_only(UnplannedPostSerializer))))
+    print('attributes_dictionary:            {:8.2f} us/resource'.format(
+        per_resource_microseconds(attributes_only(BenchmarkPostSerializer))))
+    print('collection document, unplanned:   {:8.2f} us/resource'.format(
+        per_resource_microseconds(full_document(UnplannedPostSerializer))))
+    print('collection document:              {:8.2f} us/resource'.format(
+        per_resource_microseconds(full_document(BenchmarkPostSerializer))))
+    print('encoded document bytes:           {:8.2f} us/resource'.format(per_resource_microseconds(encoded_document)))
+
+
+if __name__ == '__main__':
+    run()
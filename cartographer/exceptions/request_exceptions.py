@@ -48,6 +48,22 @@ class ParameterInvalid(JSONAPIException):
             "Invalid parameter for '{0}': {1}.".format(parameter_name, parameter_value)
 
 
+class BulkDataInvalid(JSONAPIException):
+    status_code = INVALID_REQUEST_400
+    error_title = "Some of the posted resources were invalid."
+
+    def __init__(self, row_errors):
+        """
+        :param row_errors: A map from the index of each invalid resource in `data` to the exception it raised
+        """
+        super().__init__()
+        self.row_errors = row_errors
+        self.error_description = '; '.join(
+            'data[{0}]: {1}'.format(index, ', '.join(str(arg) for arg in error.args) or type(error).__name__)
+            for index, error in sorted(row_errors.items())
+        )
+
+
 class BadPageCountParameter(ParameterInvalid):
     def __init__(self, parameter_value):
         super().__init__(parameter_name='page[count]',
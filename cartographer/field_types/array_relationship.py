@@ -1,5 +1,4 @@
 from cartographer.field_types import SchemaRelationship
-from cartographer.resources.resource_registry import ResourceRegistryKeys
 
 
 class ArrayRelationship(SchemaRelationship):
@@ -22,7 +21,7 @@ class ArrayRelationship(SchemaRelationship):
         elif self.model_method is not None:
             models = getattr(parent_serializer.model, self.model_method)()
 
-        serializer_class = self.resource_registry_entry().get(ResourceRegistryKeys.SERIALIZER)
+        serializer_class = self.resource_registry_entry().serializer
         # TODO: custom collection class, custom arguments to serializer_class
         return JSONAPICollectionSerializer([
             serializer_class(
@@ -108,6 +108,47 @@ class SchemaAttribute(object):
 
         return self.format_value_for_json(value)
 
+    def compiled_to_json(self):
+        """
+        Resolves the `read_from` source once, rather than on every call.
+        Attributes whose class customizes `to_json` or `get_value` are returned as-is.
+
+        :return: A callable which takes a serializer and returns the same value as `to_json`
+        """
+        attribute_class = type(self)
+        if attribute_class.to_json is not SchemaAttribute.to_json or \
+                attribute_class.get_value is not SchemaAttribute.get_value:
+            return self.to_json
+
+        if self.model_property:
+            model_property = self.model_property
+
+            def read_value(serializer):
+                return getattr(serializer.model, model_property)
+        elif self.model_method:
+            model_method = self.model_method
+
+            def read_value(serializer):
+                return getattr(serializer.model, model_method)()
+        elif self.serializer_method:
+            serializer_method = self.serializer_method
+
+            def read_value(serializer):
+                return getattr(serializer, serializer_method)()
+        else:
+            return self.to_json
+
+        format_value_for_json = self.format_value_for_json
+
+        def to_json(serializer):
+            value = read_value(serializer)
+            if value is None:
+                return value
+
+            return format_value_for_json(value)
+
+        return to_json
+
     @classmethod
     def format_value_for_json(cls, value):
         """
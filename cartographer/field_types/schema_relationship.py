@@ -1,5 +1,5 @@
-from cartographer.resources import get_resource_registry
-from cartographer.resources.resource_registry import ResourceRegistryKeys
+from cartographer.resources import get_resource_entry
+from cartographer.utils.include_tree import IncludeTree
 
 
 class SchemaRelationship(object):
@@ -42,6 +42,7 @@ class SchemaRelationship(object):
         self.model_method = model_method
         self.serializer_method = serializer_method
         self.includes = includes
+        self.include_tree = IncludeTree.from_includes(includes)
 
     def related_serializer(self, parent_serializer, relationship_key):
         """
@@ -52,28 +53,56 @@ class SchemaRelationship(object):
         if self.serializer_method is not None:
             return getattr(parent_serializer, self.serializer_method)()
 
+        document = getattr(parent_serializer, 'document', None)
+        if document is not None and self.id_attribute is not None:
+            model_id = getattr(parent_serializer.model, self.id_attribute)
+            if model_id is not None:
+                include_tree = self.include_tree
+                if include_tree is None:
+                    include_tree = parent_serializer.include_tree.subtree(relationship_key)
+                identity = (self.model_type, str(model_id), include_tree, parent_serializer.current_user_id)
+                return document.shared_serializer(
+                    identity,
+                    lambda: self.build_related_serializer(parent_serializer, relationship_key)
+                )
+
+        return self.build_related_serializer(parent_serializer, relationship_key)
+
+    def build_related_serializer(self, parent_serializer, relationship_key):
+        """
+        Creates a new child serializer, without consulting the document's shared serializers.
+
+        :param parent_serializer: The serializer which has our return value as a related resource
+        :param relationship_key: The name by which the parent serializer knows this child
+        :return: The child serializer which will later be used to serialize a related resource
+        """
         model = None
         if self.id_attribute is not None:
-            related_model_getter = self.resource_registry_entry().get(ResourceRegistryKeys.MODEL_GET)
-            model_id = getattr(parent_serializer.model, self.id_attribute)
-            if model_id is not None and related_model_getter is not None:
-                model = related_model_getter(model_id)
+            prefetched_models = getattr(parent_serializer, 'prefetched_models', {})
+            if relationship_key in prefetched_models:
+                # fetched alongside its siblings' related models by DocumentContext.prefetch_related_models
+                model = prefetched_models[relationship_key]
+            else:
+                related_model_getter = self.resource_registry_entry().model_get
+                model_id = getattr(parent_serializer.model, self.id_attribute)
+                if model_id is not None and related_model_getter is not None:
+                    model = related_model_getter(model_id)
         elif self.model_property is not None:
             model = getattr(parent_serializer.model, self.model_property)
         elif self.model_method is not None:
             model = getattr(parent_serializer.model, self.model_method)()
 
         if model:
-            serializer_class = self.resource_registry_entry().get(ResourceRegistryKeys.SERIALIZER)
+            serializer_class = self.resource_registry_entry().serializer
             return serializer_class(
                 model,
                 parent_serializer=parent_serializer,
                 relationship_name=relationship_key,
-                includes=self.includes
+                includes=self.include_tree
             )
         else:
             from cartographer.serializers import JSONAPINullSerializer
             return JSONAPINullSerializer()
 
     def resource_registry_entry(self):
-        return get_resource_registry().get(self.model_type, {})
+        return get_resource_entry(self.model_type)
@@ -1,5 +1,7 @@
 import itertools
+from collections.abc import Mapping
 
+from cartographer.exceptions.request_exceptions import DataMissing
 from cartographer.utils.version import get_default_version
 
 
@@ -12,11 +14,18 @@ class PostedDocument(object):
             version = get_default_version()
         self.version = version
 
+        self._data = None
+        self._resource_index = None
+
     def data(self):
-        if isinstance(self.json_data["data"], list):
-            return [PostedResource(datum, self) for datum in self.json_data["data"]]
-        else:
-            return PostedResource(self.json_data["data"], self)
+        if self._data is None:
+            if not isinstance(self.json_data, Mapping) or "data" not in self.json_data:
+                raise DataMissing()
+            if isinstance(self.json_data["data"], list):
+                self._data = [PostedResource(datum, self) for datum in self.json_data["data"]]
+            else:
+                self._data = PostedResource(self.json_data["data"], self)
+        return self._data
 
     def all_resource_json_data(self):
         data = self.json_data["data"]
@@ -30,10 +39,29 @@ class PostedDocument(object):
         return resources
 
     def find_resource_by_type_and_id(self, resource_type, resource_id):
-        for resource_json_data in self.all_resource_json_data():
-            if resource_json_data.get("type") == resource_type and resource_json_data.get("id") == resource_id:
-                return PostedResource(resource_json_data, self)
-        return None
+        try:
+            resource_json_data = self.resource_index().get((resource_type, resource_id))
+        except TypeError:  # a malformed, unhashable type or id can't match anything in the index
+            return None
+        if resource_json_data is None:
+            return None
+        return PostedResource(resource_json_data, self)
+
+    def resource_index(self):
+        """
+        :return: A map from (type, id) to the JSON of the first resource in `data` or `included` with that type and id.
+        It is built on first use, so the document should not be modified after resources are looked up in it.
+        """
+        if self._resource_index is None:
+            resource_index = {}
+            for resource_json_data in self.all_resource_json_data():
+                try:
+                    resource_index.setdefault((resource_json_data.get("type"), resource_json_data.get("id")),
+                                              resource_json_data)
+                except TypeError:
+                    continue
+            self._resource_index = resource_index
+        return self._resource_index
 
 
 class PostedResource(object):
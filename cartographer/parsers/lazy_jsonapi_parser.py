@@ -0,0 +1,20 @@
+from cartographer.parsers.jsonapi_parser import PostedDocument
+from cartographer.utils.lazy_json import lazy_json_loads
+
+
+class LazyPostedDocument(PostedDocument):
+    """
+    A `PostedDocument` over the raw bytes of a JSON API Document, rather than over decoded JSON.
+
+    Each object in the document (the resource in `data`, its `attributes` and `relationships`,
+    each resource in `included`, and so on) is only decoded when it is first accessed,
+    so an endpoint which e.g. rejects a request after reading `data.type` never builds `included`.
+    The document is read-only.
+    """
+
+    def __init__(self, raw_json, version=None):
+        """
+        :param raw_json: The posted document, as UTF-8 encoded bytes (e.g. `request.get_data()`) or as a string
+        :param version: The version of the JSON API spec that the posted document is using
+        """
+        super().__init__(json_data=lazy_json_loads(raw_json), version=version)
@@ -0,0 +1,33 @@
+from cartographer.field_types import ArrayRelationship
+
+
+class ParsePlan(object):
+    """
+    A `ParsePlan` maps each key which a `SchemaParser` subclass parses by default to where its value goes,
+    for `SchemaParser.planned_table_data` to follow:
+    * `attributes`, a map from each parseable attribute's JSON key to its (column name, decoder) pair
+    * `relationships`, a map from each parseable relationship's JSON key to its (column name, is to-many) pair
+
+    Attributes which are computed or not read from a model property are left out, as are
+    to-one relationships without an `id_attribute`, since `SchemaParser` never parses those.
+    """
+
+    __slots__ = ('attributes', 'relationships')
+
+    def __init__(self, parser_class):
+        schema = parser_class.schema()
+
+        self.attributes = {}
+        for key in schema.attributes():
+            attribute = schema.attribute(key)
+            if attribute.is_computed or not attribute.model_property:
+                continue
+            self.attributes[key] = (attribute.model_property, attribute.from_json)
+
+        self.relationships = {}
+        for key in schema.relationships():
+            relationship = schema.relationship(key)
+            if isinstance(relationship, ArrayRelationship):
+                self.relationships[key] = (key, True)
+            elif relationship.id_attribute:
+                self.relationships[key] = (relationship.id_attribute, False)
@@ -1,4 +1,6 @@
+from cartographer.exceptions.request_exceptions import BulkDataInvalid, JSONAPIException
 from cartographer.parsers.jsonapi_parser import PostedDocument
+from cartographer.parsers.parse_plan import ParsePlan
 from cartographer.field_types import ArrayRelationship
 from cartographer.utils.version import get_default_version
 
@@ -57,11 +59,79 @@ class SchemaParser(PostedDocument):
         """Override this in a subclass to define model <=> API mappings"""
         raise NotImplementedError()
 
+    @classmethod
+    def parse_plan(cls):
+        """
+        :return: The `ParsePlan` of this class's `schema`, built on first use
+        """
+        plan = cls.__dict__.get('_parse_plan')
+        if plan is None:
+            plan = ParsePlan(cls)
+            cls._parse_plan = plan
+        return plan
+
+    @classmethod
+    def uses_default_parsing(cls):
+        """
+        :return: Whether this class parses every key the default way,
+        in which case `table_data` can follow the `parse_plan` instead of calling the per-key methods.
+        """
+        return (cls.should_parse_attribute is SchemaParser.should_parse_attribute and
+                cls.parse_schema_attribute is SchemaParser.parse_schema_attribute and
+                cls.should_parse_relationship is SchemaParser.should_parse_relationship and
+                cls.parse_schema_relationship is SchemaParser.parse_schema_relationship)
+
     def validated_table_data(self):
         """The primary use case for this class. Simply calls validate, then returns the table data"""
         self.validate(self.data())
         return self.table_data()
 
+    def validated_table_data_many(self):
+        """
+        The bulk counterpart of `validated_table_data`, for documents whose `data` is an array.
+        Every resource is validated and parsed, even after one of them fails,
+        so that the client can be told about all of its mistakes at once.
+
+        :return: A list of table data, one per resource in `data`, in order,
+        suitable to pass to a single multi-row `.insert().values(...)` call
+        :raises BulkDataInvalid: If any resource failed validation or parsing, with the errors of each by index
+        """
+        return [table_data for _, table_data in self.iter_validated_table_data_many()]
+
+    def iter_validated_table_data_many(self, resources=None):
+        """
+        The streaming counterpart of `validated_table_data_many`,
+        which validates and parses each resource only when it is reached.
+        Pass it `StreamingPostedDocument.iter_data()` to parse a bulk upload in bounded memory.
+        Since rows are yielded before later rows are validated,
+        callers should write them in a transaction which is rolled back on `BulkDataInvalid`.
+
+        :param resources: An iterable of `PostedResource`s, defaulting to those in this document's `data`
+        :return: A generator of (`PostedResource`, table data) pairs, one per valid resource, in order
+        :raises BulkDataInvalid: Once every resource has been read, if any failed validation or parsing
+        with a `JSONAPIException`, `ValueError` or `TypeError`. Other exceptions are raised immediately.
+        """
+        if resources is None:
+            resources = self.data_many()
+        row_errors = {}
+        for index, resource in enumerate(resources):
+            try:
+                self.validate(resource)
+                table_data = self.resource_table_data(resource)
+            except (JSONAPIException, ValueError, TypeError) as e:
+                row_errors[index] = e
+                continue
+            yield resource, table_data
+        if row_errors:
+            raise BulkDataInvalid(row_errors)
+
+    def data_many(self):
+        """
+        :return: The posted resources as a list, whether `data` is an array or a single resource
+        """
+        data = self.data()
+        return data if isinstance(data, list) else [data]
+
     # # Parsing
 
     def table_data(self):
@@ -71,9 +141,12 @@ class SchemaParser(PostedDocument):
         :return: A map from column names to their values
         """
         if self._table_data is None:
-            result = {}
-
             data = self.data()
+            if type(self).uses_default_parsing():
+                self._table_data = self.planned_table_data(data)
+                return self._table_data
+
+            result = {}
 
             json_attributes = data.json_data.get('attributes', {})
             if json_attributes:
@@ -96,6 +169,70 @@ class SchemaParser(PostedDocument):
             self._table_data = result
         return self._table_data
 
+    def table_data_many(self):
+        """
+        The bulk counterpart of `table_data`, without validation.
+
+        :return: A list of maps from column names to their values, one per resource in `data`, in order
+        """
+        return [self.resource_table_data(resource) for resource in self.data_many()]
+
+    def resource_table_data(self, resource):
+        """
+        :param resource: One of the `PostedResource`s in this document's `data`
+        :return: The `table_data` of that resource alone
+        """
+        if type(self).uses_default_parsing():
+            return self.planned_table_data(resource)
+        return self.resource_parser(resource).table_data()
+
+    def resource_parser(self, resource):
+        """
+        :param resource: A `PostedResource`, typically one of those in this document's `data`
+        :return: A parser of this class whose `data` is that resource alone,
+        so that the per-key parsing methods can be applied to it
+        """
+        parser = type(self)(json_data=resource.document.json_data, parent_parser=self, version=self.version)
+        parser._data = resource
+        parser._resource_index = resource.document.resource_index()
+        return parser
+
+    def planned_table_data(self, data):
+        """
+        Parses the given resource in a single pass over its posted attributes and relationships,
+        with the same result as calling `parse_schema_attribute` and `parse_schema_relationship` for each key.
+
+        :param data: The `PostedResource` to parse
+        :return: A map from column names to their values
+        """
+        plan = self.parse_plan()
+        result = {}
+
+        json_attributes = data.json_data.get('attributes')
+        if json_attributes:
+            attribute_plans = plan.attributes
+            for key, serialized_value in json_attributes.items():
+                attribute_plan = attribute_plans.get(key)
+                if attribute_plan is not None:
+                    column_name, from_json = attribute_plan
+                    result[column_name] = from_json(serialized_value)
+
+        json_relationships = data.json_data.get('relationships')
+        if json_relationships:
+            relationship_plans = plan.relationships
+            for key, relationship_json in json_relationships.items():
+                relationship_plan = relationship_plans.get(key)
+                if relationship_plan is None or 'data' not in relationship_json:
+                    continue
+                column_name, is_to_many = relationship_plan
+                linkage = relationship_json['data']
+                if is_to_many:
+                    result[column_name] = [{'id': datum.get('id')} for datum in linkage or []]
+                else:
+                    result[column_name] = linkage.get('id') if linkage is not None else None
+
+        return result
+
     def meta(self):
         """
         :return: Dictionary of all meta attributes
@@ -142,16 +279,20 @@ class SchemaParser(PostedDocument):
         * an array of maps from 'id' *for the other table* to corresponding parsed values.
         """
         schema_relationship = self.schema().relationship(key)
-        if schema_relationship:
+        posted_relationship = self.data().relationship(key)
+        if schema_relationship and posted_relationship and 'data' in posted_relationship.json_data:
             # TODO: redo array relationship parsing.
             # there was a thing where everything was nested under keys. probably that.
+            # null linkage empties a to-many relationship, and clears a to-one relationship
+            is_null = posted_relationship.json_data['data'] is None
             if isinstance(schema_relationship, ArrayRelationship):
-                return key, [
+                return key, [] if is_null else [
                     {'id': x.resource_id()}
-                    for x in self.data().relationship_id(key)
+                    for x in posted_relationship.relationship_id()
                 ]
             elif schema_relationship.id_attribute:
-                return schema_relationship.id_attribute, self.data().relationship_id(key).resource_id()
+                resource_id = None if is_null else posted_relationship.relationship_id().resource_id()
+                return schema_relationship.id_attribute, resource_id
         return None
         # TODO: let SchemaRelationship declare parser_method
 
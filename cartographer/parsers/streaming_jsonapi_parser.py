@@ -0,0 +1,79 @@
+from cartographer.exceptions.request_exceptions import DataMissing
+from cartographer.parsers.jsonapi_parser import PostedDocument, PostedResource
+from cartographer.utils.json_stream import JSONStreamReader
+
+
+class StreamingPostedDocument(PostedDocument):
+    """
+    A reader for JSON API Documents which are too large to decode in full, such as bulk uploads.
+
+    Rather than taking decoded JSON, it reads the document from a stream (typically `request.stream`)
+    and yields the resources in `data` one at a time from `iter_data`,
+    so that only one resource is decoded at any time.
+    Resources in `included` are indexed as they arrive, for `find_resource_by_type_and_id`.
+    Since the stream is read only once, relationships can only be followed to included resources
+    which came before the resource being read, so clients should send `included` ahead of `data`.
+    Every other top-level member, e.g. `meta`, is decoded into `json_data` as it arrives.
+    """
+
+    def __init__(self, stream, version=None, chunk_size=64 * 1024):
+        """
+        :param stream: A file-like object whose `read(size)` returns the UTF-8 encoded document
+        :param version: The version of the JSON API spec that the posted document is using
+        :param chunk_size: The number of bytes read from the stream at a time
+        """
+        super().__init__(json_data={}, version=version)
+        self.reader = JSONStreamReader(stream, chunk_size)
+        self.data_is_array = None
+        self._resource_index = {}
+        self._is_read = False
+
+    def iter_data(self):
+        """
+        Reads the rest of the document, yielding a `PostedResource` for each resource in `data` as it arrives.
+        This can only be done once.
+        """
+        if self._is_read:
+            raise ValueError("A StreamingPostedDocument can only be read once")
+        self._is_read = True
+
+        reader = self.reader
+        for key in reader.iter_object_keys():
+            if key == 'data':
+                self.data_is_array = reader.peek() == '['
+                if self.data_is_array:
+                    for resource_json_data in reader.iter_array_items():
+                        yield PostedResource(resource_json_data, self)
+                else:
+                    resource_json_data = reader.read_value()
+                    if resource_json_data is not None:
+                        yield PostedResource(resource_json_data, self)
+            elif key == 'included':
+                for resource_json_data in reader.iter_array_items():
+                    self.index_resource(resource_json_data)
+            else:
+                self.json_data[key] = reader.read_value()
+
+        if self.data_is_array is None:
+            raise DataMissing()
+
+    def data(self):
+        """Reads the whole of `data` into memory. Prefer `iter_data` for large documents."""
+        if not self._is_read:
+            resources = list(self.iter_data())
+            if self.data_is_array:
+                self._data = resources
+            else:
+                self._data = resources[0] if resources else None
+        return self._data
+
+    def index_resource(self, resource_json_data):
+        try:
+            self._resource_index.setdefault((resource_json_data.get("type"), resource_json_data.get("id")),
+                                            resource_json_data)
+        except TypeError:  # a malformed, unhashable type or id can't be looked up anyway
+            pass
+
+    def all_resource_json_data(self):
+        """:return: The included resources which have been read so far"""
+        return iter(self._resource_index.values())
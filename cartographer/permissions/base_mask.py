@@ -21,6 +21,10 @@ class BaseMask(object):
     * `includes_cant_edit` (always called after `can_edit`)
     * `includes_cant_delete` (always called after `can_edit`)
 
+    When serializing a document, `fields_cant_view_many` and `includes_cant_view_many`
+    are called once per type per include depth, in place of their per-model counterparts.
+    Override them to answer for many models with e.g. a single query.
+
     By using `SchemaResource` and `SchemaParser`,
     the corresponding Mask for your resource will be used at (de)serialization time
     to appropriately remove fields from the output, or disallow their input.
@@ -105,6 +109,15 @@ class BaseMask(object):
         """
         return []
 
+    @classmethod
+    def fields_cant_view_many(cls, models, user_id):
+        """
+        :param models: The models which the user is trying to view attributes of
+        :param user_id: The user on behalf of whom permission is being requested
+        :return: A list holding the `fields_cant_view` result for each of the given models, in the same order
+        """
+        return [cls.fields_cant_view(model, user_id) for model in models]
+
     @classmethod
     def fields_cant_edit(cls, model, user_id):
         """
@@ -133,6 +146,15 @@ class BaseMask(object):
         """
         return []
 
+    @classmethod
+    def includes_cant_view_many(cls, models, user_id):
+        """
+        :param models: The models which the user is trying to view relationships of
+        :param user_id: The user on behalf of whom permission is being requested
+        :return: A list holding the `includes_cant_view` result for each of the given models, in the same order
+        """
+        return [cls.includes_cant_view(model, user_id) for model in models]
+
     @classmethod
     def includes_cant_edit(cls, model, user_id):
         """
@@ -1,13 +1,26 @@
 import json
-import re
 
 from cartographer.exceptions.request_exceptions import DataMissing, BadPageCountParameter, BadPageCursorParameter, \
     BadPageOffsetParameter
 from cartographer.requests.jsonapi_request_interface import JSONAPIRequestInterface
+from cartographer.requests.query_parameters import JSONAPIQueryParameters, REQUEST_PLAN_CACHE, \
+    parse_bracketed_parameters
 from cartographer.utils.version import JSONAPIVersion, get_default_version
 
 
 class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
+    # The `LRUCache` of `JSONAPIRequestPlan`s shared across requests, or None to build a plan for every request
+    request_plan_cache = REQUEST_PLAN_CACHE
+
+    def get_query_parameters(self):
+        """
+        Returns the request's JSON API query parameters as `JSONAPIQueryParameters`, parsed only once per request.
+        The getters below read from it, so their return values are shared and must not be modified.
+        """
+        if not hasattr(self, '_query_parameters'):
+            self._query_parameters = JSONAPIQueryParameters.from_args(self.args, self.request_plan_cache)
+        return self._query_parameters
+
     def get_jsonapi_json(self):
         force_if_correct_mime = (self.mimetype == 'application/vnd.api+json')
         return self.get_json(force=force_if_correct_mime)
@@ -27,10 +40,11 @@ class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
         return data
 
     def get_sort(self):
-        return self.args.get('sort')
+        return self.get_query_parameters().sort
 
     def get_pagination(self, page_count_default=10, cursor_formatter=None):
-        per_page = self.args.get('page[count]')
+        page = self.get_query_parameters().page
+        per_page = page.get('count')
         if per_page is not None:
             if per_page != 'infinity':
                 try:
@@ -40,14 +54,14 @@ class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
         else:
             per_page = page_count_default
 
-        page_cursor = self.args.get('page[cursor]')
+        page_cursor = page.get('cursor')
         if page_cursor is not None and cursor_formatter is not None:
             try:
                 page_cursor = cursor_formatter(page_cursor)
             except:
                 raise BadPageCursorParameter(page_cursor)
 
-        page_offset = self.args.get('page[offset]')
+        page_offset = page.get('offset')
         if page_offset is not None:
             try:
                 page_offset = int(page_offset)
@@ -57,20 +71,16 @@ class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
         return page_cursor, page_offset, per_page
 
     def get_includes(self):
-        """Returns a list of the requested resources to include in the response for this request."""
-        includes_string = self.args.get('include')
-        if includes_string:
-            if includes_string in ['null', 'none', '[]']:
-                return []
-            else:
-                return includes_string.split(',')
-        else:
-            return None
+        """Returns a tuple of the requested resources to include in the response for this request."""
+        return self.get_query_parameters().includes
+
+    def get_include_tree(self):
+        """Returns the requested includes as an `IncludeTree`, parsed only once per request."""
+        return self.get_query_parameters().include_tree
 
     def get_requested_fields(self):
-        """Returns a list of the requested attributes to include in the response for this request."""
-        type_to_list = self.dictionary_from_get('fields')
-        return {key: val.split(',') for key, val in type_to_list.items()}
+        """Returns a map from resource types to a tuple of their requested attributes for this request."""
+        return self.get_query_parameters().requested_fields
 
     def get_included(self):
         """Returns a list of the included resources sent from the client"""
@@ -89,7 +99,7 @@ class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
         ]
 
     def get_filters(self):
-        return self.dictionary_from_get('filter')
+        return self.get_query_parameters().filters
 
     def get_bool(self, key):
         val = self.args.get(key)
@@ -100,36 +110,14 @@ class JSONAPIFlaskRequestMixin(JSONAPIRequestInterface):
     def get_json_api_version(self, default_version=None):
         if default_version is None:
             default_version = get_default_version()
-        return JSONAPIVersion(self.args.get('json-api-version', default_version))
+        plan = self.get_query_parameters().plan
+        if plan.version is not None:
+            return plan.version
+        return JSONAPIVersion(plan.version_string if plan.version_string is not None else default_version)
 
     def dictionary_from_get(self, outer_key):
-        return self._parse_parameters_to_dictionary(self.args).get(outer_key, {})
+        return self.get_query_parameters().bracketed.get(outer_key, {})
 
     @staticmethod
     def _parse_parameters_to_dictionary(params):
-        pattern = re.compile('([^\[\]]+)\[(.*)\]')
-        return_dict = {}
-
-        for key in params.keys():
-            match_data = pattern.fullmatch(key)
-            if not match_data:
-                continue
-
-            match_groups = match_data.groups()
-            if len(match_groups) != 2:
-                continue
-
-            prefix = match_groups[0]
-            path = match_groups[1].split('][')
-            result_for_prefix = return_dict.get(prefix, {})
-            current_result = result_for_prefix
-            for index, step in enumerate(path):
-                if index == len(path) - 1:
-                    current_result[step] = params[key]
-                else:
-                    if step not in current_result:
-                        current_result[step] = {}
-                    current_result = current_result[step]
-            return_dict[prefix] = result_for_prefix
-
-        return return_dict
+        return parse_bracketed_parameters(params)
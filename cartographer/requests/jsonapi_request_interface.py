@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+from cartographer.utils.include_tree import IncludeTree
+
 
 class JSONAPIRequestInterface(object):
     _metaclass__ = ABCMeta
@@ -16,6 +18,10 @@ class JSONAPIRequestInterface(object):
     def get_includes(self):
         return
 
+    def get_include_tree(self):
+        includes = self.get_includes()
+        return IncludeTree.from_paths(includes) if includes is not None else None
+
     @abstractmethod
     def get_requested_fields(self):
         return
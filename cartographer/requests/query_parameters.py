@@ -0,0 +1,185 @@
+import re
+from collections import namedtuple
+from types import MappingProxyType
+
+from cartographer.utils.include_tree import IncludeTree
+from cartographer.utils.lru_cache import LRUCache
+from cartographer.utils.version import JSONAPIVersion
+
+_BRACKETED_PARAMETER = re.compile(r'([^\[\]]+)\[(.*)\]')
+_FIELDS_PREFIX = 'fields['
+
+
+class JSONAPIRequestPlan(namedtuple('JSONAPIRequestPlan', [
+    'includes', 'include_tree', 'requested_fields', 'version_string', 'version',
+])):
+    """
+    The shape of a request's response, as requested by its query parameters,
+    which is shared by every request asking for the same includes, fields and version:
+    * `includes`, a sorted tuple of the distinct requested include paths, or None if `include` wasn't given
+    * `include_tree`, those paths as an `IncludeTree`, or None
+    * `requested_fields`, a read-only map from resource types to sorted tuples of their distinct requested attributes
+    * `version_string`, the `json-api-version` string, or None
+    * `version`, that string as a `JSONAPIVersion`, or None if it was missing or invalid
+
+    Since clients tend to ask for the same few shapes over and over,
+    plans are kept in a bounded cache keyed by their normalized parameters,
+    so that repeated shapes skip parsing, building the include tree, and validating the version.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_args(cls, args, cache=None):
+        """
+        :param args: The query string arguments of the request, e.g. flask's `request.args`
+        :param cache: An `LRUCache` of plans by normalized parameters, or None to always build a new plan
+        :return: The `JSONAPIRequestPlan` for those arguments
+        """
+        key = cls.normalized_key(args)
+        if cache is None:
+            return cls.from_normalized_key(key)
+        plan = cache.get(key)
+        if plan is None:
+            plan = cls.from_normalized_key(key)
+            cache.set(key, plan)
+        return plan
+
+    @staticmethod
+    def normalized_key(args):
+        """
+        :return: The (includes, fields, version string) which determine the plan,
+        with includes and fields sorted and deduplicated, so that equivalent query strings share a plan
+        """
+        includes = parse_includes(args.get('include'))
+        if includes:
+            includes = tuple(sorted(set(includes)))
+        fields = []
+        for key, value in args.items():
+            if key.startswith(_FIELDS_PREFIX) and key.endswith(']') and isinstance(value, str):
+                resource_type = key[len(_FIELDS_PREFIX):-1]
+                if resource_type and '][' not in resource_type:
+                    fields.append((resource_type, tuple(sorted(set(value.split(','))))))
+        return includes, tuple(sorted(fields)), args.get('json-api-version')
+
+    @classmethod
+    def from_normalized_key(cls, key):
+        includes, fields, version_string = key
+        try:
+            version = JSONAPIVersion(version_string) if version_string is not None else None
+        except ValueError:  # raised again by `get_json_api_version`, if anything asks for the version
+            version = None
+        return cls(
+            includes=includes,
+            include_tree=IncludeTree.from_paths(includes) if includes is not None else None,
+            requested_fields=MappingProxyType(dict(fields)),
+            version_string=version_string,
+            version=version,
+        )
+
+
+# Shared by every request; clear it, or set `JSONAPIFlaskRequestMixin.request_plan_cache`, to change it
+REQUEST_PLAN_CACHE = LRUCache(max_entries=1024)
+
+
+class JSONAPIQueryParameters(namedtuple('JSONAPIQueryParameters', [
+    'plan', 'filters', 'page', 'sort', 'bracketed',
+])):
+    """
+    The JSON API query parameters of one request, parsed once and never modified afterwards:
+    * `plan`, the request's `JSONAPIRequestPlan`, which also provides
+    `includes`, `include_tree`, `requested_fields` and `version_string` here
+    * `filters`, the read-only `filter[...]` parameters
+    * `page`, the read-only `page[...]` parameters
+    * `sort`, the `sort` string, or None
+    * `bracketed`, every read-only `prefix[key]...` parameter, by prefix
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_args(cls, args, plan_cache=None):
+        """
+        :param args: The query string arguments of the request, e.g. flask's `request.args`
+        :param plan_cache: An `LRUCache` of `JSONAPIRequestPlan`s to share plans across requests, or None
+        :return: The parsed `JSONAPIQueryParameters`
+        """
+        bracketed = _read_only(parse_bracketed_parameters(args))
+        return cls(
+            plan=JSONAPIRequestPlan.from_args(args, plan_cache),
+            filters=bracketed.get('filter', _EMPTY_MAPPING),
+            page=bracketed.get('page', _EMPTY_MAPPING),
+            sort=args.get('sort'),
+            bracketed=bracketed,
+        )
+
+    @property
+    def includes(self):
+        return self.plan.includes
+
+    @property
+    def include_tree(self):
+        return self.plan.include_tree
+
+    @property
+    def requested_fields(self):
+        return self.plan.requested_fields
+
+    @property
+    def version_string(self):
+        return self.plan.version_string
+
+
+def parse_includes(includes_string):
+    """
+    :param includes_string: The value of the `include` query parameter
+    :return: A tuple of the include paths, or None if no includes were requested
+    """
+    if includes_string:
+        if includes_string in ['null', 'none', '[]']:
+            return ()
+        else:
+            return tuple(includes_string.split(','))
+    else:
+        return None
+
+
+def parse_bracketed_parameters(params):
+    """
+    :param params: A map of query parameters
+    :return: A map from the prefix of every parameter like `prefix[key][nested]` to its nested values
+    """
+    return_dict = {}
+
+    for key in params.keys():
+        match_data = _BRACKETED_PARAMETER.fullmatch(key)
+        if not match_data:
+            continue
+
+        match_groups = match_data.groups()
+        if len(match_groups) != 2:
+            continue
+
+        prefix = match_groups[0]
+        path = match_groups[1].split('][')
+        result_for_prefix = return_dict.get(prefix, {})
+        current_result = result_for_prefix
+        for index, step in enumerate(path):
+            if index == len(path) - 1:
+                current_result[step] = params[key]
+            else:
+                if step not in current_result:
+                    current_result[step] = {}
+                current_result = current_result[step]
+        return_dict[prefix] = result_for_prefix
+
+    return return_dict
+
+
+def _read_only(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _read_only(nested_value) for key, nested_value in value.items()})
+    return value
+
+
+_EMPTY_MAPPING = MappingProxyType({})
@@ -10,4 +10,12 @@ def get_resource_registry_container():
 
 
 def get_resource_registry():
-    return get_resource_registry_container().registry
+    """
+    :return: A read-only `ResourceRegistryView` of the whole registry, which imports a lazily registered type's module
+    only when that type is read. Change the registry through `get_resource_registry_container()`.
+    """
+    return get_resource_registry_container().view()
+
+
+def get_resource_entry(type_string):
+    return get_resource_registry_container().entry(type_string)
@@ -24,7 +24,10 @@ class APIResource(metaclass=APIResourceMetaClass):
     MASK = BaseMask
     MODEL = None
     MODEL_GET = None
+    MODEL_GET_MANY = None
     MODEL_PRIME = None
+    MODEL_GET_ASYNC = None
+    MODEL_PRIME_ASYNC = None
 
     @classmethod
     def type_string(cls):
@@ -45,8 +48,14 @@ class APIResource(metaclass=APIResourceMetaClass):
                 cls.MODEL = wrapped_class
             if registry_key == ResourceRegistryKeys.MODEL_GET:
                 cls.MODEL_GET = wrapped_class
+            if registry_key == ResourceRegistryKeys.MODEL_GET_MANY:
+                cls.MODEL_GET_MANY = wrapped_class
             if registry_key == ResourceRegistryKeys.MODEL_PRIME:
                 cls.MODEL_PRIME = wrapped_class
+            if registry_key == ResourceRegistryKeys.MODEL_GET_ASYNC:
+                cls.MODEL_GET_ASYNC = wrapped_class
+            if registry_key == ResourceRegistryKeys.MODEL_PRIME_ASYNC:
+                cls.MODEL_PRIME_ASYNC = wrapped_class
 
             cls.register_class()
 
@@ -70,5 +79,8 @@ class APIResource(metaclass=APIResourceMetaClass):
             mask=cls.MASK,
             model=cls.MODEL,
             model_get=cls.MODEL_GET,
-            model_prime=cls.MODEL_PRIME
+            model_get_many=cls.MODEL_GET_MANY,
+            model_prime=cls.MODEL_PRIME,
+            model_get_async=cls.MODEL_GET_ASYNC,
+            model_prime_async=cls.MODEL_PRIME_ASYNC,
         )
@@ -1,5 +1,11 @@
-from collections import defaultdict
+import gc
+import time
+from collections import defaultdict, namedtuple
+from collections.abc import Mapping
 from enum import Enum
+from importlib import import_module
+from threading import RLock, local
+from types import MappingProxyType
 
 from cartographer.utils.collections import filter_dict
 
@@ -12,33 +18,284 @@ class ResourceRegistryKeys(Enum):
     MASK = "mask"
     MODEL = "model"
     MODEL_GET = "model_get"
+    MODEL_GET_MANY = "model_get_many"
     MODEL_PRIME = "model_prime"
+    MODEL_GET_ASYNC = "model_get_async"
+    MODEL_PRIME_ASYNC = "model_prime_async"
+
+
+class ResourceRegistryEntry(namedtuple('ResourceRegistryEntry', [key.value for key in ResourceRegistryKeys])):
+    """
+    The classes and functions registered for one type, as an immutable record with one attribute per
+    `ResourceRegistryKeys` member, e.g. `entry.serializer`. Anything which wasn't registered is None.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, registry_dict):
+        """:param registry_dict: A map from `ResourceRegistryKeys` to values, as kept in `ResourceRegistry.registry`"""
+        return cls(*(registry_dict.get(key) for key in ResourceRegistryKeys))
+
+    def get(self, registry_key, default=None):
+        """Looks a `ResourceRegistryKeys` member up like the dicts in `ResourceRegistry.registry`"""
+        value = getattr(self, registry_key.value)
+        return default if value is None else value
+
+
+EMPTY_ENTRY = ResourceRegistryEntry.from_dict({})
+
+# How long importing a lazily registered module took, for `ResourceRegistry.import_report`
+LazyImportTiming = namedtuple('LazyImportTiming', ['import_path', 'type_strings', 'seconds'])
 
 
 class ResourceRegistry(object):
     def __init__(self):
+        # change this only through `register_resource` and `unregister`, which keep the lookup caches in sync
         self.registry = defaultdict(dict)
         self.initialization_hook = None
         self.hook_called = False
+        self.frozen = None
+        self.lazy_registrations = {}
+        self.import_timings = []
+        self._lock = RLock()
+        self._entries = {}
+        self._proxies = None
+        self._types_by_model = None
+        self._importing = local()
 
     def set_initialization_hook(self, hook=None):
         self.initialization_hook = hook
 
     def call_initialization_hook(self):
-        if not self.hook_called and self.initialization_hook:
-            self.initialization_hook()
-            self.hook_called = True
+        if self.hook_called or not self.initialization_hook:
+            return
+        with self._lock:
+            # checked again under the lock, so that threads racing to the first lookup only call the hook once
+            if not self.hook_called and self.initialization_hook:
+                self.initialization_hook()
+                self.hook_called = True
 
     def register_resource(self, type_string, schema,
                           serializer=None, parser=None, mask=None,
-                          model=None, model_get=None, model_prime=None,):
-        self.registry[type_string].update(filter_dict({
-            ResourceRegistryKeys.TYPE: type_string,
-            ResourceRegistryKeys.SCHEMA: schema,
-            ResourceRegistryKeys.SERIALIZER: serializer,
-            ResourceRegistryKeys.PARSER: parser,
-            ResourceRegistryKeys.MASK: mask,
-            ResourceRegistryKeys.MODEL: model,
-            ResourceRegistryKeys.MODEL_GET: model_get,
-            ResourceRegistryKeys.MODEL_PRIME: model_prime
-        }))
+                          model=None, model_get=None, model_prime=None, model_get_many=None,
+                          model_get_async=None, model_prime_async=None):
+        with self._lock:
+            self.registry[type_string].update(filter_dict({
+                ResourceRegistryKeys.TYPE: type_string,
+                ResourceRegistryKeys.SCHEMA: schema,
+                ResourceRegistryKeys.SERIALIZER: serializer,
+                ResourceRegistryKeys.PARSER: parser,
+                ResourceRegistryKeys.MASK: mask,
+                ResourceRegistryKeys.MODEL: model,
+                ResourceRegistryKeys.MODEL_GET: model_get,
+                ResourceRegistryKeys.MODEL_GET_MANY: model_get_many,
+                ResourceRegistryKeys.MODEL_PRIME: model_prime,
+                ResourceRegistryKeys.MODEL_GET_ASYNC: model_get_async,
+                ResourceRegistryKeys.MODEL_PRIME_ASYNC: model_prime_async,
+            }))
+            self._registry_changed()
+
+    def unregister(self, type_string, *registry_keys):
+        """
+        :param type_string: The type to remove registrations from
+        :param registry_keys: The `ResourceRegistryKeys` to remove, or none to remove the whole type
+        """
+        with self._lock:
+            if registry_keys:
+                for registry_key in registry_keys:
+                    self.registry.get(type_string, {}).pop(registry_key, None)
+            else:
+                self.registry.pop(type_string, None)
+            self._registry_changed()
+
+    def _registry_changed(self):
+        # changing the registry after `freeze` is allowed, but drops the snapshot until the next `freeze`
+        self.frozen = None
+        self._entries = {}
+        self._proxies = None
+        self._types_by_model = None
+
+    def view(self):
+        """:return: A `ResourceRegistryView` of this registry"""
+        return ResourceRegistryView(self)
+
+    def registered_proxies(self):
+        """:return: A read-only map from each registered type string to a read-only view of its registry dict"""
+        proxies = self._proxies
+        if proxies is None:
+            with self._lock:
+                proxies = MappingProxyType({
+                    type_string: MappingProxyType(registry_dict)
+                    for type_string, registry_dict in self.registry.items()
+                })
+                self._proxies = proxies
+        return proxies
+
+    def types_for_model(self, model):
+        """
+        Lazily registered modules aren't imported, since no model can have been served through their types yet.
+
+        :param model: A model class
+        :return: A tuple of the registered type strings whose `MODEL` is that class
+        """
+        types_by_model = self._types_by_model
+        if types_by_model is None:
+            with self._lock:
+                types_by_model = defaultdict(tuple)
+                for type_string, registry_dict in self.registry.items():
+                    registered_model = registry_dict.get(ResourceRegistryKeys.MODEL)
+                    if registered_model is not None:
+                        types_by_model[registered_model] += (type_string,)
+                self._types_by_model = types_by_model
+        return types_by_model.get(model, ())
+
+    def register_lazy(self, type_string, import_path):
+        """
+        Defers registering a type until it is first looked up by `entry`,
+        which then imports the module at `import_path`, e.g. the module defining the type's `APIResource`.
+        Processes which only touch a few types then skip importing every other resource, model and their dependencies.
+
+        :param type_string: The type which the module registers when imported
+        :param import_path: The dotted path of the module
+        """
+        with self._lock:
+            if type_string not in self.registry:
+                self.lazy_registrations[type_string] = import_path
+
+    def resolve_lazy(self, type_string):
+        """
+        Imports the module lazily registered for the type, if it hasn't been imported yet.
+        Threads looking up the type meanwhile wait for the same import, through Python's import lock.
+        """
+        import_path = self.lazy_registrations.get(type_string)
+        importing = self._importing.__dict__.setdefault('paths', set())
+        if import_path is None or import_path in importing:
+            return  # already imported, or the module is looking itself up while it's being imported
+
+        # the import happens outside the registry's lock, since the module's own `register_resource` calls take it,
+        # and a thread importing the module directly holds the import lock while waiting for ours
+        was_frozen = self.frozen is not None
+        importing.add(import_path)
+        started_at = time.perf_counter()
+        try:
+            import_module(import_path)
+        finally:
+            importing.discard(import_path)
+        seconds = time.perf_counter() - started_at
+
+        with self._lock:
+            type_strings = tuple(sorted(
+                lazy_type for lazy_type, lazy_path in self.lazy_registrations.items() if lazy_path == import_path
+            ))
+            if not type_strings:
+                return  # resolved by another thread
+            for lazy_type in type_strings:
+                del self.lazy_registrations[lazy_type]
+            self.import_timings.append(LazyImportTiming(import_path, type_strings, seconds))
+            if was_frozen:
+                self.freeze()
+
+    def resolve_all_lazy(self):
+        """Imports every lazily registered module, e.g. before serving requests in a long-lived process"""
+        for type_string in list(self.lazy_registrations):
+            self.resolve_lazy(type_string)
+
+    def import_report(self):
+        """:return: A `LazyImportTiming` for each lazily registered module imported so far, slowest first"""
+        return sorted(self.import_timings, key=lambda timing: timing.seconds, reverse=True)
+
+    def freeze(self):
+        """
+        Snapshots the registry into a read-only map from type strings to `ResourceRegistryEntry`s,
+        which `entry` then serves without building a record per lookup.
+        Call this once every resource has been registered, e.g. at the end of app setup.
+
+        :return: The snapshot
+        """
+        with self._lock:
+            self.frozen = MappingProxyType({
+                type_string: ResourceRegistryEntry.from_dict(registry_dict)
+                for type_string, registry_dict in self.registry.items()
+            })
+            return self.frozen
+
+    def compile(self, verify=True, freeze_gc=False):
+        """
+        Does all of the per-class setup that would otherwise happen on first use, then `freeze`s the registry:
+        resolves lazy registrations, compiles (and verifies) every registered schema,
+        and builds every serializer's `SerializationPlan` and parser's `ParsePlan`.
+        Call this once at startup, after every resource is registered; in a prefork server,
+        call it before forking so that workers share the compiled structures copy-on-write.
+
+        :param verify: Whether to verify each schema, raising `ValueError` on the first misconfiguration
+        :param freeze_gc: Whether to then move every object into the garbage collector's permanent generation
+        (`gc.freeze`), so that collections in forked workers don't touch, and so copy, the shared pages
+        :return: The frozen registry
+        """
+        self.resolve_all_lazy()
+        with self._lock:
+            for registry_dict in list(self.registry.values()):
+                entry = ResourceRegistryEntry.from_dict(registry_dict)
+                if entry.schema is not None and hasattr(entry.schema, 'compile'):
+                    entry.schema.compile(verify=verify)
+                _build_plan(entry.serializer, 'serialization_plan')
+                _build_plan(entry.parser, 'parse_plan')
+            frozen = self.freeze()
+
+        if freeze_gc and hasattr(gc, 'freeze'):
+            gc.collect()
+            gc.freeze()
+        return frozen
+
+    def entry(self, type_string):
+        """:return: The `ResourceRegistryEntry` for the type, which is `EMPTY_ENTRY` if nothing is registered for it"""
+        if type_string in self.lazy_registrations:
+            self.resolve_lazy(type_string)
+        frozen = self.frozen
+        if frozen is not None:
+            return frozen.get(type_string, EMPTY_ENTRY)
+        entries = self._entries
+        entry = entries.get(type_string)
+        if entry is None:
+            registry_dict = self.registry.get(type_string)
+            entry = ResourceRegistryEntry.from_dict(registry_dict) if registry_dict else EMPTY_ENTRY
+            entries[type_string] = entry
+        return entry
+
+
+class ResourceRegistryView(Mapping):
+    """
+    A read-only map from type strings to read-only maps from `ResourceRegistryKeys` to values.
+    Lazily registered types are listed, but their module is only imported when their own values are read.
+    """
+
+    __slots__ = ('_registry',)
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __getitem__(self, type_string):
+        if type_string in self._registry.lazy_registrations:
+            self._registry.resolve_lazy(type_string)
+        return self._registry.registered_proxies()[type_string]
+
+    def __contains__(self, type_string):
+        return type_string in self._registry.registered_proxies() or type_string in self._registry.lazy_registrations
+
+    def __iter__(self):
+        registered = self._registry.registered_proxies()
+        lazy = [type_string for type_string in list(self._registry.lazy_registrations) if type_string not in registered]
+        return iter(list(registered) + lazy)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _build_plan(registered_class, plan_method_name):
+    if registered_class is None or not hasattr(registered_class, plan_method_name):
+        return
+    try:
+        getattr(registered_class, plan_method_name)()
+    except NotImplementedError:  # e.g. `APIResource`'s default `SchemaParser`, which has no schema to plan
+        pass
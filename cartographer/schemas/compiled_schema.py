@@ -0,0 +1,67 @@
+from types import MappingProxyType
+
+from cartographer.field_types import SchemaRelationship
+
+
+class CompiledSchema(object):
+    """
+    A `CompiledSchema` is a `Schema` subclass's `SCHEMA`, verified and frozen once so that lookups
+    don't have to go back through the raw dict:
+    * `resource_type`, the JSON API `type` string
+    * `resource_id`, the `SchemaAttribute` of the resource `id`
+    * `attribute_keys` and `relationship_keys`, tuples of keys in schema order
+    * `attributes` and `relationships`, read-only maps from keys to their field types
+    * `attribute_accessors`, a read-only map from attribute keys to their compiled `to_json` callables
+
+    `Schema.compile` builds one, which `Schema.compiled_schema` then returns.
+    """
+
+    __slots__ = ('resource_type', 'resource_id', 'attribute_keys', 'relationship_keys',
+                 'attributes', 'relationships', 'attribute_accessors')
+
+    def __init__(self, schema_class):
+        schema = schema_class.schema()
+
+        self.resource_type = schema.get('type')
+        self.resource_id = schema.get('id')
+
+        attributes = schema.get('attributes', {})
+        self.attribute_keys = tuple(attributes.keys())
+        self.attributes = MappingProxyType(dict(attributes))
+        self.attribute_accessors = MappingProxyType({
+            key: attribute.compiled_to_json()
+            for key, attribute in attributes.items()
+        })
+
+        relationships = schema.get('relationships', {})
+        self.relationship_keys = tuple(relationships.keys())
+        self.relationships = MappingProxyType(dict(relationships))
+
+
+def verify_schema(schema_class):
+    """
+    Checks that every part of a `Schema` subclass's `SCHEMA` is in a usable state.
+
+    :raises ValueError: naming the schema and key of the first problem found
+    """
+    schema = schema_class.schema()
+    name = schema_class.__name__
+
+    if not isinstance(schema.get('type'), str):
+        raise ValueError('{}: `type` must be a string.'.format(name))
+
+    resource_id = schema.get('id')
+    if resource_id is None:
+        raise ValueError('{}: `id` must be a `SchemaAttribute`.'.format(name))
+    fields = [('id', resource_id)] + list(schema.get('attributes', {}).items())
+    for key, attribute in fields:
+        try:
+            attribute.verify_configuration()
+        except ValueError as e:
+            raise ValueError('{}.{}: {}'.format(name, key, e)) from e
+
+    for key, relationship in schema.get('relationships', {}).items():
+        if not isinstance(relationship, SchemaRelationship):
+            raise ValueError('{}.{}: relationships must be `SchemaRelationship`s.'.format(name, key))
+        if not relationship.model_type:
+            raise ValueError('{}.{}: relationships must have a `model_type`.'.format(name, key))
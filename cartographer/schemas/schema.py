@@ -1,3 +1,6 @@
+from cartographer.schemas.compiled_schema import CompiledSchema, verify_schema
+
+
 class Schema(object):
     """
     The core element of the Cartographer system is the Schema.
@@ -30,6 +33,9 @@ class Schema(object):
     * `resource_id` to access the `SchemaAttribute` class corresponding to the `id` of the resource
     * `attributes` to list all attribute keys, and `attribute` to look up one particular attribute
     * `relationships` to list all attribute keys, and `relationship` to look up one particular relationship
+
+    Once a schema is final, `compile` verifies it and freezes it into a `CompiledSchema`,
+    which these methods then read from instead of the raw `SCHEMA` dict.
     """
 
     @classmethod
@@ -44,30 +50,70 @@ class Schema(object):
         # with subclasses appending the plural form if they want.
         return None
 
+    @classmethod
+    def compile(cls, verify=True):
+        """
+        Freezes this class's schema into a `CompiledSchema`, e.g. at startup, before forking workers.
+        Compiling a parent schema class doesn't compile its subclasses.
+
+        :param verify: Whether to check the schema with `verify_schema` first, raising `ValueError` on problems
+        :return: The `CompiledSchema`
+        """
+        compiled = cls.compiled_schema()
+        if compiled is None:
+            if verify:
+                verify_schema(cls)
+            compiled = CompiledSchema(cls)
+            cls._compiled_schema = compiled
+        return compiled
+
+    @classmethod
+    def compiled_schema(cls):
+        """:return: The `CompiledSchema` from `compile`, or None if this class hasn't been compiled"""
+        return cls.__dict__.get('_compiled_schema')
+
     # Convenience methods for accessing pieces of the schema.
 
     @classmethod
     def resource_type(cls):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return compiled.resource_type
         return cls.schema().get('type')
 
     @classmethod
     def resource_id(cls):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return compiled.resource_id
         return cls.schema().get('id')
 
     @classmethod
     def attributes(cls):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return list(compiled.attribute_keys)
         return list(cls.schema().get('attributes', {}).keys())
 
     @classmethod
     def attribute(cls, key):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return compiled.attributes.get(key)
         return cls.schema().get('attributes', {}).get(key)
 
     @classmethod
     def relationships(cls):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return list(compiled.relationship_keys)
         return list(cls.schema().get('relationships', {}).keys())
 
     @classmethod
     def relationship(cls, key):
+        compiled = cls.__dict__.get('_compiled_schema')
+        if compiled is not None:
+            return compiled.relationships.get(key)
         return cls.schema().get('relationships', {}).get(key)
 
     @classmethod
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+
+from cartographer.resources import get_resource_entry
+from cartographer.serializers.schema_serializer import SchemaSerializer
+from cartographer.utils import config
+from cartographer.utils.executors import map_in_executor
+
+
+class DocumentContext(object):
+    """
+    `DocumentContext` holds the work shared by every serializer in a single JSON API document.
+
+    Its main job is `resolve_linked_resources`, which walks the include tree breadth-first
+    before anything is rendered. Walking level by level means every sibling at one include depth
+    is known before any of their relationships are resolved,
+    so their related models can be fetched with one `MODEL_GET_MANY` call per type,
+    rather than with one `MODEL_GET` call per parent.
+    Their masks are evaluated together in the same way.
+
+    It also keeps an identity map of related serializers,
+    so that e.g. 200 posts sharing 3 authors create 3 author serializers rather than 200.
+    Every `SchemaSerializer` created beneath the top-level resources shares their `document`.
+
+    `resolve_linked_resources_async` walks the tree the same way for asyncio code,
+    awaiting every `MODEL_GET_ASYNC` fetch at one include depth together,
+    so that independent relationship branches are fetched concurrently rather than one after another.
+
+    If the top-level resource has an `executor`, each level's relationships
+    and `MODEL_GET_MANY` calls are resolved in parallel on it instead,
+    while the included resources keep the order they would have had if resolved serially.
+
+    `suppressed_default_includes` counts the default-included relationships which serializers using
+    `strict_includes` didn't expand, i.e. how many related resources (or collections) the defaults
+    would have pulled in at the next depth. It is reported to `config.suppressed_default_includes_hook`.
+    """
+
+    def __init__(self, root):
+        """
+        :param root: The `JSONAPISerializer` whose document is being built
+        """
+        self.root = root
+        self.serializers = {}
+        self.executor = root.document_executor()
+        self.suppressed_default_includes = 0
+        self._suppressed_default_includes_lock = threading.Lock()
+
+    def shared_serializer(self, identity, build_serializer):
+        """
+        :param identity: A hashable key which determines the serializer's output within this document,
+            typically (type, id, include tree, current user id)
+        :param build_serializer: A function which creates the serializer, called only the first time `identity` is seen
+        :return: The one serializer for `identity` in this document
+        """
+        serializer = self.serializers.get(identity)
+        if serializer is None:
+            # siblings resolving in parallel may race to build the same serializer, in which case the first one wins
+            serializer = self.serializers.setdefault(identity, build_serializer())
+        return serializer
+
+    def resolve_linked_resources(self):
+        level, resolved_keys = self.first_level()
+        while level:
+            self.load_level(level)
+            level = self.next_level(level, resolved_keys, self.executor)
+        self.report_suppressed_default_includes()
+
+    async def resolve_linked_resources_async(self):
+        level, resolved_keys = self.first_level()
+        while level:
+            await self.load_level_async(level)
+            level = self.next_level(level, resolved_keys)
+        self.report_suppressed_default_includes()
+
+    def record_suppressed_default_includes(self, count):
+        # serializers may be created on several executor threads at once
+        with self._suppressed_default_includes_lock:
+            self.suppressed_default_includes += count
+
+    def report_suppressed_default_includes(self):
+        hook = config.suppressed_default_includes_hook
+        if self.suppressed_default_includes and hook is not None:
+            hook(self.root, self.suppressed_default_includes)
+
+    def first_level(self):
+        """:return: The top-level resources, which now share this document, and the set of their keys"""
+        if self.root.is_collection():
+            level = list(self.root.members())
+        else:
+            level = [self.root]
+        resolved_keys = set(resource.resource_key() for resource in level)
+
+        for resource in level:
+            if isinstance(resource, SchemaSerializer) and resource.document is None:
+                resource.document = self
+
+        return level, resolved_keys
+
+    @staticmethod
+    def next_level(level, resolved_keys, executor=None):
+        """
+        :param level: The resources at the current include depth
+        :param resolved_keys: The keys of every resource already visited, which is updated in place
+        :param executor: An `Executor` on which to resolve the resources' relationships in parallel, or None
+        :return: The resources at the next include depth, with collections flattened into their members
+        """
+        next_level = []
+        linked_resources_by_resource = map_in_executor(executor, _list_of_linked_resources, level)
+        for linked_resources in linked_resources_by_resource:
+            for linked_resource in linked_resources:
+                if linked_resource.is_collection():
+                    children = linked_resource.members()
+                else:
+                    children = [linked_resource]
+                for child in children:
+                    child_key = child.resource_key()
+                    if child_key is None or child_key not in resolved_keys:
+                        resolved_keys.add(child_key)
+                        next_level.append(child)
+        return next_level
+
+    def load_level(self, level):
+        """Override this in a subclass to batch additional work across the siblings at one include depth"""
+        self.load_masks(level)
+        self.prefetch_related_models(level, self.executor)
+
+    async def load_level_async(self, level):
+        """Override this in a subclass to batch additional work across the siblings at one include depth"""
+        self.load_masks(level)
+        await self.prefetch_related_models_async(level)
+
+    @staticmethod
+    def load_masks(level):
+        """
+        Evaluates the masks of the given siblings with one `fields_cant_view_many`
+        and one `includes_cant_view_many` call per mask and user,
+        rather than with one `fields_cant_view` and one `includes_cant_view` call per serializer.
+
+        :param level: The resources at one include depth
+        """
+        fields_pending = {}
+        includes_pending = {}
+        for serializer in level:
+            if not isinstance(serializer, SchemaSerializer):
+                continue
+            mask_key = (serializer.mask_class(), serializer.current_user_id)
+            if serializer._masked_fields is None:
+                fields_pending.setdefault(mask_key, []).append(serializer)
+            # relationships which aren't included never consult the mask, so neither do we
+            if serializer._masked_includes is None and serializer.include_tree:
+                includes_pending.setdefault(mask_key, []).append(serializer)
+
+        for (mask_class, user_id), serializers in fields_pending.items():
+            masked_fields = mask_class.fields_cant_view_many([serializer.model for serializer in serializers], user_id)
+            for serializer, fields in zip(serializers, masked_fields):
+                serializer._masked_fields = fields
+
+        for (mask_class, user_id), serializers in includes_pending.items():
+            masked_includes = mask_class.includes_cant_view_many([serializer.model for serializer in serializers],
+                                                                 user_id)
+            for serializer, includes in zip(serializers, masked_includes):
+                serializer._masked_includes = includes
+
+    @staticmethod
+    def prefetch_related_models(level, executor=None):
+        """
+        Fetches the to-one related models that the given siblings are about to include,
+        with one `MODEL_GET_MANY` call per related type.
+        Types without a registered `MODEL_GET_MANY` are left to `MODEL_GET`,
+        after calling their `MODEL_PRIME` once per distinct id, so that e.g. a multiget cache
+        can answer those `MODEL_GET` calls with one query per type.
+        Relationships which won't be included are neither fetched nor primed.
+
+        :param level: The resources at one include depth
+        :param executor: An `Executor` on which to make the calls for different types in parallel, or None
+        """
+        pending, ids_by_type = DocumentContext.pending_related_models(level)
+
+        batches = []
+        for relationship_type, ids in ids_by_type.items():
+            entry = get_resource_entry(relationship_type)
+            if entry.model_get_many is not None:
+                batches.append((relationship_type, entry.model_get_many, list(ids)))
+            elif entry.model_prime is not None:
+                for model_id in ids:
+                    entry.model_prime(model_id)
+        models = map_in_executor(executor, lambda batch: batch[1](batch[2]), batches)
+        models_by_type = {relationship_type: models_for_type
+                          for (relationship_type, _, _), models_for_type in zip(batches, models)}
+
+        DocumentContext.assign_prefetched_models(pending, models_by_type)
+
+    @staticmethod
+    async def prefetch_related_models_async(level):
+        """
+        Fetches the to-one related models that the given siblings are about to include,
+        awaiting one `MODEL_GET_ASYNC` call per distinct (type, id) together, after any `MODEL_PRIME_ASYNC` calls.
+        Types without a registered `MODEL_GET_ASYNC` are fetched by `prefetch_related_models` instead.
+
+        :param level: The resources at one include depth
+        """
+        pending, ids_by_type = DocumentContext.pending_related_models(level)
+
+        primes = []
+        fetches = []
+        models_by_type = {}
+        for relationship_type, ids in ids_by_type.items():
+            entry = get_resource_entry(relationship_type)
+            if entry.model_get_async is None:
+                continue
+            if entry.model_prime_async is not None:
+                primes.extend(entry.model_prime_async(model_id) for model_id in ids)
+            fetches.extend((relationship_type, model_id, entry.model_get_async) for model_id in ids)
+            models_by_type[relationship_type] = {}
+
+        if primes:
+            await asyncio.gather(*primes)
+        models = await asyncio.gather(*(model_get_async(model_id) for _, model_id, model_get_async in fetches))
+        for (relationship_type, model_id, _), model in zip(fetches, models):
+            models_by_type[relationship_type][model_id] = model
+        DocumentContext.assign_prefetched_models(pending, models_by_type)
+
+        if len(models_by_type) < len(ids_by_type):
+            DocumentContext.prefetch_related_models(level)
+
+    @staticmethod
+    def pending_related_models(level):
+        """
+        :param level: The resources at one include depth
+        :return: A list of (serializer, relationship key, related type, related id) for every to-one relationship
+        which is about to be included but hasn't been fetched yet, and a map from each type to its distinct ids
+        """
+        pending = []
+        ids_by_type = {}
+        for serializer in level:
+            if not isinstance(serializer, SchemaSerializer) or serializer.has_resolved_linked_resources():
+                continue
+            plan = serializer.serialization_plan()
+            for key, relationship_type, id_attribute in plan.primed_relationships:
+                if key in serializer.prefetched_models or not serializer.should_include_relationship(key):
+                    continue
+                model_id = getattr(serializer.model, id_attribute, None)
+                if model_id is None:
+                    continue
+                pending.append((serializer, key, relationship_type, model_id))
+                ids_by_type.setdefault(relationship_type, {})[model_id] = True
+        return pending, ids_by_type
+
+    @staticmethod
+    def assign_prefetched_models(pending, models_by_type):
+        for serializer, key, relationship_type, model_id in pending:
+            if relationship_type in models_by_type:
+                serializer.prefetched_models[key] = models_by_type[relationship_type].get(model_id)
+
+
+def _list_of_linked_resources(resource):
+    return resource.list_of_linked_resources()
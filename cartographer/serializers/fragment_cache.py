@@ -0,0 +1,87 @@
+from cartographer.utils.lru_cache import LRUCache
+
+
+class FragmentCache(object):
+    """
+    A `FragmentCache` stores the `as_json_api_data` output of `SchemaSerializer`s across requests.
+
+    Fragment keys are tuples which begin with the resource's (type, id),
+    followed by whatever else determines the serialized output (see `SchemaSerializer.fragment_key`).
+    Subclass this to back the cache with an external store.
+    """
+
+    def get(self, fragment_key):
+        """
+        :param fragment_key: The key of the fragment
+        :return: The cached fragment, or None if it is not cached
+        """
+        raise NotImplementedError()
+
+    def set(self, fragment_key, fragment):
+        """
+        :param fragment_key: The key of the fragment
+        :param fragment: The `as_json_api_data` output to cache, which must not be modified afterwards
+        """
+        raise NotImplementedError()
+
+    def invalidate(self, resource_type, resource_id=None):
+        """
+        Drops every cached fragment of the given resource, in every version and field set.
+
+        :param resource_type: The JSON API `type` of the resource
+        :param resource_id: The JSON API `id` string of the resource, or None to drop every resource of the type
+        """
+        raise NotImplementedError()
+
+
+class LRUFragmentCache(FragmentCache):
+    """An in-process `FragmentCache`, which evicts least recently used fragments and expires stale ones"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=300):
+        """
+        :param max_entries: The number of fragments kept before the least recently used is evicted
+        :param ttl_seconds: The number of seconds a fragment is served for, or None to serve it until invalidated
+        """
+        self.fragments = LRUCache(max_entries, ttl_seconds, on_evict=self._forget_fragment_key)
+        self.fragment_keys_by_resource = {}
+
+    # Fragments are copied on the way in and out, so that callers modifying a document can't change the cache.
+    # The index of fragment keys by resource is only touched under the LRU's lock.
+
+    def get(self, fragment_key):
+        return _copy_json(self.fragments.get(fragment_key))
+
+    def set(self, fragment_key, fragment):
+        fragment = _copy_json(fragment)
+        with self.fragments.lock:
+            self.fragment_keys_by_resource.setdefault(fragment_key[:2], set()).add(fragment_key)
+            self.fragments.set(fragment_key, fragment)
+
+    def invalidate(self, resource_type, resource_id=None):
+        with self.fragments.lock:
+            if resource_id is not None:
+                resource_keys = [(resource_type, resource_id)]
+            else:
+                resource_keys = [resource_key
+                                 for resource_key in self.fragment_keys_by_resource
+                                 if resource_key[0] == resource_type]
+
+            for resource_key in resource_keys:
+                for fragment_key in list(self.fragment_keys_by_resource.pop(resource_key, ())):
+                    self.fragments.delete(fragment_key)
+
+    def _forget_fragment_key(self, fragment_key):  # called by `self.fragments` under its lock
+        fragment_keys = self.fragment_keys_by_resource.get(fragment_key[:2])
+        if fragment_keys is not None:
+            fragment_keys.discard(fragment_key)
+            if not fragment_keys:
+                self.fragment_keys_by_resource.pop(fragment_key[:2], None)
+
+
+def _copy_json(value):
+    """:return: A copy of decoded JSON, down to its scalars; encoded bytes are immutable, and returned as-is"""
+    if isinstance(value, dict):
+        return {key: _copy_json(nested_value) for key, nested_value in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
@@ -1,5 +1,5 @@
 from cartographer.serializers import JSONAPISerializer
-from cartographer.utils.version import JSONAPIVersion
+from cartographer.serializers.version_strategies import get_version_strategy
 
 
 class JSONAPICollectionSerializer(JSONAPISerializer):
@@ -24,6 +24,11 @@ class JSONAPICollectionSerializer(JSONAPISerializer):
     def is_collection(self):
         return True
 
+    def document_executor(self):
+        if self.executor is None and self.members():
+            return self.members()[0].document_executor()
+        return self.executor
+
     def next_page_url(self):
         return self.links.get('next')
 
@@ -79,24 +84,8 @@ class JSONAPICollectionSerializer(JSONAPISerializer):
         return [member.as_linkage_json() for member in self.members()]
 
     def as_link_json(self, version):
-        # if we drop RC2, then this override will probably go away
-        if version == JSONAPIVersion.JSONAPI_RC2:
-            return self.as_link_json_rc2(version)
-        elif version == JSONAPIVersion.JSONAPI_RC3 or version == JSONAPIVersion.JSONAPI_1_0:
-            key = 'data' if version == JSONAPIVersion.JSONAPI_1_0 else 'linkage'
-            link_json = {key: self.as_linkage_json()}
-            if version == JSONAPIVersion.JSONAPI_1_0:
-                links = self.relationship_urls_json(version)
-                if links:
-                    link_json['links'] = links
-            else:
-                link_json.update(self.relationship_urls_json(version))
-            meta = self.meta()
-            if meta is not None:
-                link_json["meta"] = meta
-            return link_json
-        else:
-            raise ValueError("Unknown JSON API version")
+        # if we drop RC2, then `as_link_json_rc2` will probably go away
+        return get_version_strategy(version).collection_link_json(self)
 
     def as_json_api_data(self, version):
         return [member.as_json_api_data(version) for member in self.members()]
@@ -1,5 +1,5 @@
 from cartographer.serializers import JSONAPISerializer
-from cartographer.utils.version import JSONAPIVersion
+from cartographer.serializers.version_strategies import get_version_strategy
 
 
 class JSONAPINullSerializer(JSONAPISerializer):
@@ -7,11 +7,4 @@ class JSONAPINullSerializer(JSONAPISerializer):
         return None
 
     def as_link_json(self, version):
-        if version == JSONAPIVersion.JSONAPI_RC2:
-            return {"id": None}
-        elif version == JSONAPIVersion.JSONAPI_RC3:
-            return {"linkage": self.as_linkage_json()}
-        elif version == JSONAPIVersion.JSONAPI_1_0:
-            return {"data": self.as_linkage_json()}
-        else:
-            raise ValueError("Unknown JSON API version")
+        return get_version_strategy(version).null_link_json()
@@ -1,10 +1,17 @@
-import importlib
+import importlib.util
 from collections import deque
 
-from cartographer.utils.version import get_default_version, JSONAPIVersion
+from cartographer.serializers.version_strategies import get_version_strategy
+from cartographer.utils.json_encoding import get_json_encoder
+from cartographer.utils.version import get_default_version
 
 
 class JSONAPISerializer(object):
+    # An `Executor` (e.g. `cartographer.utils.executors.default_executor()`) on which to resolve
+    # sibling relationships in parallel, which helps when fetching related models blocks on I/O.
+    # None resolves everything on the calling thread.
+    executor = None
+
     def resource_id(self):
         """Override this in a subclass to return a unique id string"""
         raise NotImplementedError()
@@ -28,24 +35,65 @@ class JSONAPISerializer(object):
     def relationship_url(self):
         return None
 
+    def document_executor(self):
+        """:return: The `executor` used while resolving a document with this resource at its top level"""
+        return self.executor
+
     # internal usage
 
     def as_json_api_document(self, version=None):
         version = self._get_version(version)
+        self.resolve_linked_resources()
+        return self.document_with_data(self.as_json_api_data(version), version)
+
+    async def as_json_api_document_async(self, version=None):
+        """
+        Builds the same document as `as_json_api_document`, for use from asyncio code.
+        Related models are fetched with the `MODEL_GET_ASYNC` coroutines registered for their types,
+        with every fetch at one include depth awaited together.
+        """
+        version = self._get_version(version)
+        await self.resolve_linked_resources_async()
         return self.document_with_data(self.as_json_api_data(version), version)
 
+    def resolve_linked_resources(self):
+        """
+        Resolves every resource in this document breadth-first before any of it is rendered,
+        so that siblings at the same include depth can batch their model fetches.
+        """
+        from cartographer.serializers.document_context import DocumentContext
+        DocumentContext(self).resolve_linked_resources()
+
+    async def resolve_linked_resources_async(self):
+        from cartographer.serializers.document_context import DocumentContext
+        await DocumentContext(self).resolve_linked_resources_async()
+
+    # The id string, key and linkage of a resource are read many times while building one document
+    # (once per edge pointing at it, plus once more to render it), so each is computed only once.
+
     def resource_id_str(self):
-        id_ = self.resource_id()
-        return str(id_) if id_ is not None else None
+        try:
+            return self._resource_id_str
+        except AttributeError:
+            id_ = self.resource_id()
+            self._resource_id_str = str(id_) if id_ is not None else None
+            return self._resource_id_str
 
     def resource_key(self):
         try:
-            if self.resource_id_str():
-                return (self.resource_type(), self.resource_id_str())
+            return self._resource_key
+        except AttributeError:
+            pass
+        try:
+            resource_id_str = self.resource_id_str()
+            if resource_id_str:
+                resource_key = (self.resource_type(), resource_id_str)
             else:  # Collection or Null
-                return None
+                resource_key = None
         except NotImplementedError:
-            return None
+            resource_key = None
+        self._resource_key = resource_key
+        return resource_key
 
     def is_collection(self):
         return False
@@ -54,7 +102,10 @@ class JSONAPISerializer(object):
         return self.linked_resources().values()
 
     def deeply_linked_resources(self, skip_self=True):
-        all_linked_resources = []
+        return list(self.iter_deeply_linked_resources(skip_self))
+
+    def iter_deeply_linked_resources(self, skip_self=True):
+        """Yields each linked resource in breadth-first order, as soon as it is discovered"""
         q = deque()
         resources_enqueued = set()
 
@@ -62,7 +113,7 @@ class JSONAPISerializer(object):
             linked_key = linked_resource.resource_key()
             if (not linked_key or
                     (linked_key not in resources_enqueued)):
-                q.append(linked_resource)
+                q.append((linked_resource, linked_key))
                 resources_enqueued.add(linked_key)
 
         def enqueue_linked_resources(resource):
@@ -87,14 +138,12 @@ class JSONAPISerializer(object):
             enqueue_if_never_enqued(self)
 
         while q:
-            resource = q.popleft()
-            if resource.resource_key():
-                all_linked_resources.append(resource)
+            resource, resource_key = q.popleft()
+            if resource_key:
+                yield resource
 
             enqueue_linked_resources(resource)
 
-        return all_linked_resources
-
     def deeply_linked_resources_as_json(self, version, skip_self=True):
         return list(filter(None, [
             resource.as_json_api_data(version)
@@ -109,32 +158,23 @@ class JSONAPISerializer(object):
         }
 
     def as_linkage_json(self):
-        return {"type": self.resource_type(), "id": self.resource_id_str()}
+        # the type and id are worked out once, but each caller gets its own dict to embed in its document
+        try:
+            resource_type, resource_id = self._linkage
+        except AttributeError:
+            resource_type, resource_id = self._linkage = (self.resource_type(), self.resource_id_str())
+        return {"type": resource_type, "id": resource_id}
 
     def relationship_urls_json(self, version):
         relationship_urls_json = {}
         if self.relationship_url():
             relationship_urls_json["self"] = self.relationship_url()
         if self.resource_url():
-            if version == JSONAPIVersion.JSONAPI_RC2:
-                relationship_urls_json["resource"] = self.resource_url()
-            elif version == JSONAPIVersion.JSONAPI_RC3 or version == JSONAPIVersion.JSONAPI_1_0:
-                relationship_urls_json["related"] = self.resource_url()
-            else:
-                raise ValueError("Unknown JSON API version")
+            relationship_urls_json[get_version_strategy(version).related_url_key] = self.resource_url()
         return relationship_urls_json
 
     def as_link_json(self, version):
-        link_json = {}
-
-        if version == JSONAPIVersion.JSONAPI_RC2:
-            link_json.update(self.as_linkage_json())
-        elif version == JSONAPIVersion.JSONAPI_RC3:
-            link_json["linkage"] = self.as_linkage_json()
-        elif version == JSONAPIVersion.JSONAPI_1_0:
-            link_json["data"] = self.as_linkage_json()
-        else:
-            raise ValueError("Unknown JSON API version")
+        link_json = get_version_strategy(version).link_json(self.as_linkage_json())
 
         links = self.relationship_urls_json(version)
         if links:
@@ -147,23 +187,13 @@ class JSONAPISerializer(object):
         return link_json
 
     def as_json_api_data(self, version):
-        if version == JSONAPIVersion.JSONAPI_1_0:
-            attributes = self.attributes_dictionary()
-            if 'id' in attributes:
-                del attributes['id']
-            json = {'attributes': attributes}
-        else:
-            json = self.attributes_dictionary()
-        json["id"] = self.resource_id_str()
-        json["type"] = self.resource_type()
-        links = self.resource_links_json(version)
-        if links:
-            if version == JSONAPIVersion.JSONAPI_1_0:
-                json["relationships"] = links
-            else:
-                json["links"] = links
         # TODO: optional keys: "meta"
-        return json
+        return get_version_strategy(version).resource_json(
+            self.attributes_dictionary(),
+            self.resource_id_str(),
+            self.resource_type(),
+            self.resource_links_json(version)
+        )
 
     def next_page_url(self):
         return None
@@ -191,15 +221,11 @@ class JSONAPISerializer(object):
         return {key: value for key, value in links.items() if value}
 
     def included_resources_key(self, version):
-        if version == JSONAPIVersion.JSONAPI_RC2:
-            return "linked"
-        elif version == JSONAPIVersion.JSONAPI_RC3 or version == JSONAPIVersion.JSONAPI_1_0:
-            return "included"
-        else:
-            raise ValueError("Unknown JSON API version")
+        return get_version_strategy(version).included_resources_key
 
     def as_json_api_relationship_document(self, version=None):
         version = self._get_version(version)
+        self.resolve_linked_resources()
         return self.document_with_data(self.as_linkage_json(), version, False)
 
     def document_with_data(self, data, version, skip_self=True):
@@ -215,6 +241,70 @@ class JSONAPISerializer(object):
             response["meta"] = meta
         return response
 
+    def as_json_api_bytes(self, version=None, encoder=None):
+        """
+        :return: The same document as `as_json_api_document`, already encoded as UTF-8 JSON bytes,
+            ready to be used as a response body.
+            Each resource is encoded through `as_json_api_data_bytes`, so cached fragments are spliced in as-is.
+        """
+        return b''.join(self.iter_json_api_document(version, encoder))
+
+    def as_json_api_data_bytes(self, version, encoder=None):
+        """
+        :return: `as_json_api_data`, encoded as UTF-8 JSON bytes.
+            Override this in a subclass to return bytes which were encoded ahead of time.
+        """
+        return (encoder or get_json_encoder())(self.as_json_api_data(version))
+
+    def iter_json_api_document(self, version=None, encoder=None):
+        """
+        Yields the same document as `as_json_api_document`, as UTF-8 encoded JSON chunks.
+        Like `as_json_api_document`, it first resolves every resource in the document,
+        so every related model and serializer is loaded before the first chunk is yielded.
+        Only the rendering is streamed: each resource's JSON is built and encoded when it is written,
+        so the document's dicts and encoded bytes are never held all at once,
+        but memory still grows with the number of resources in the document.
+        This pairs with e.g. `flask.Response(flask.stream_with_context(...))`.
+
+        :param encoder: The function used to encode JSON, defaulting to `get_json_encoder()`
+        """
+        version = self._get_version(version)
+        encoder = encoder or get_json_encoder()
+        self.resolve_linked_resources()
+
+        yield b'{"data":'
+        if self.is_collection():
+            yield b'['
+            for index, member in enumerate(self.members()):
+                if index:
+                    yield b','
+                yield member.as_json_api_data_bytes(version, encoder)
+            yield b']'
+        else:
+            yield self.as_json_api_data_bytes(version, encoder)
+
+        has_included_resources = False
+        for resource in self.iter_deeply_linked_resources():
+            resource_bytes = resource.as_json_api_data_bytes(version, encoder)
+            if resource_bytes in _EMPTY_JSON:
+                continue
+            if has_included_resources:
+                yield b','
+            else:
+                yield b',' + encoder(self.included_resources_key(version)) + b':['
+                has_included_resources = True
+            yield resource_bytes
+        if has_included_resources:
+            yield b']'
+
+        links = self.document_links_urls()
+        if links:
+            yield b',"links":' + encoder(links)
+        meta = self.meta()
+        if meta is not None:
+            yield b',"meta":' + encoder(meta)
+        yield b'}'
+
     def _get_version(self, version=None):
         return version or self._flask_json_api_version() or get_default_version()
 
@@ -222,7 +312,7 @@ class JSONAPISerializer(object):
 
     @staticmethod
     def _has_flask_request_context():
-        return importlib.util.find_spec("flask") is not None
+        return _FLASK_INSTALLED
 
     @staticmethod
     def _flask_json_api_version():
@@ -231,3 +321,9 @@ class JSONAPISerializer(object):
             if request:
                 return request.get_json_api_version()
         return None
+
+
+_FLASK_INSTALLED = importlib.util.find_spec("flask") is not None
+
+# `document_with_data` leaves out included resources whose data is empty
+_EMPTY_JSON = (b'null', b'{}')
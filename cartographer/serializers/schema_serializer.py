@@ -1,9 +1,10 @@
-from cartographer.field_types import ArrayRelationship, SchemaRelationship
 from cartographer.permissions.base_mask import BaseMask
-from cartographer.resources import get_resource_registry
-from cartographer.resources.resource_registry import ResourceRegistryKeys
+from cartographer.resources import get_resource_entry
 from cartographer.serializers import JSONAPISerializer
+from cartographer.serializers.serialization_plan import SerializationPlan
 from cartographer.utils import config
+from cartographer.utils.executors import map_in_executor
+from cartographer.utils.include_tree import IncludeTree
 
 
 class SchemaSerializer(JSONAPISerializer):
@@ -12,8 +13,17 @@ class SchemaSerializer(JSONAPISerializer):
     It does so by subclassing `JSONAPISerializer`, and implementing its main four methods --
     `resource_id`, `resource_type`, `attributes_dictionary`, and `linked_resources` --
     using the passed-in model and the associated `schema`.
+
+    Subclasses may set `fragment_cache` to a `FragmentCache`
+    to reuse their `as_json_api_data` output across requests.
     """
 
+    fragment_cache = None
+
+    # Whether related resources which weren't asked to include anything include nothing,
+    # rather than falling back to `default_includes`. None defers to `cartographer.utils.config.strict_includes`.
+    strict_includes = None
+
     def __init__(self, model,
                  inbound_request=None, inbound_session=None,
                  parent_serializer=None, relationship_name=None,
@@ -28,7 +38,8 @@ class SchemaSerializer(JSONAPISerializer):
         :param inbound_session: The `JSONAPISession` which is active during the creation of this resource
         :param parent_serializer: The `JSONAPISerializer` which is creating this instance as one of its `linked_resources`
         :param relationship_name: The name by which the parent_serializer refers to this instance
-        :param includes: An array of strings, representing the relationships which should be serialized
+        :param includes: An array of strings (or an `IncludeTree`),
+            representing the relationships which should be serialized
         :param requested_fields: A map from strings to arrays of strings,
             representing the resource types and their associated attributes which should be serialized
         :param current_user_id: The ID of the user on behalf of whom the resource is being created
@@ -45,21 +56,24 @@ class SchemaSerializer(JSONAPISerializer):
             if not current_user_id:
                 current_user_id = parent_serializer.current_user_id
 
-        if includes is None:
+        suppressed_default_includes = 0
+        include_tree = IncludeTree.from_includes(includes)
+        if include_tree is None:
             if parent_serializer is not None and relationship_name is not None:
-                prefix = relationship_name + '.'
-                includes = [include_path[len(prefix):]
-                            for include_path in parent_serializer.includes
-                            if include_path.startswith(prefix)]
-                if len(includes) == 0:
-                    # TODO: kill all uses of request.args.get('use-defaults-for-included-resources') in clients
-                    includes = type(self).default_includes()
+                include_tree = parent_serializer.include_tree.subtree(relationship_name)
+                if not include_tree:
+                    default_include_tree = type(self).serialization_plan().default_include_tree
+                    if type(self).uses_strict_includes():
+                        suppressed_default_includes = len(default_include_tree)
+                    else:
+                        # TODO: kill all uses of request.args.get('use-defaults-for-included-resources') in clients
+                        include_tree = default_include_tree
             else:
                 if inbound_request:
-                    includes = inbound_request.get_includes()
-                if includes is None:
-                    includes = type(self).default_includes()
-        self.includes = includes
+                    include_tree = inbound_request.get_include_tree()
+                if include_tree is None:
+                    include_tree = type(self).serialization_plan().default_include_tree
+        self.include_tree = include_tree
 
         if requested_fields is None and inbound_request:
             requested_fields = inbound_request.get_requested_fields()
@@ -69,7 +83,13 @@ class SchemaSerializer(JSONAPISerializer):
             current_user_id = inbound_session.user_id
         self.current_user_id = current_user_id
 
+        # set by DocumentContext on top-level resources, and shared with every related resource beneath them
+        self.document = getattr(parent_serializer, 'document', None)
+        if suppressed_default_includes and self.document is not None:
+            self.document.record_suppressed_default_includes(suppressed_default_includes)
+
         self._linked_resources = None
+        self.prefetched_models = {}
         self._masked_fields = None
         self._masked_includes = None
 
@@ -80,6 +100,18 @@ class SchemaSerializer(JSONAPISerializer):
         """Override this in a subclass to define model <=> API mappings"""
         raise NotImplementedError()
 
+    @classmethod
+    def serialization_plan(cls):
+        """
+        :return: The `SerializationPlan` for this class, built on first use.
+        The plan is looked up in this class's own `__dict__`, never inherited from a parent serializer.
+        """
+        plan = cls.__dict__.get('_serialization_plan')
+        if plan is None:
+            plan = SerializationPlan(cls)
+            cls._serialization_plan = plan
+        return plan
+
     @classmethod
     def default_fields(cls):
         """Override this in a subclass to define which attributes should be included by default"""
@@ -90,24 +122,28 @@ class SchemaSerializer(JSONAPISerializer):
         """Override this in a subclass to define which relationships should be included by default"""
         return cls.schema().relationships()
 
+    @classmethod
+    def uses_strict_includes(cls):
+        return config.strict_includes if cls.strict_includes is None else cls.strict_includes
+
     @classmethod
     def model_class(cls):
-        return get_resource_registry().get(cls.resource_type(), {}).get(ResourceRegistryKeys.MODEL)
+        return get_resource_entry(cls.resource_type()).model
 
     @classmethod
     def serializer_class(cls):
-        return get_resource_registry().get(cls.resource_type(), {}).get(ResourceRegistryKeys.SERIALIZER)
+        return get_resource_entry(cls.resource_type()).serializer
 
     @classmethod
     def mask_class(cls):
-        return get_resource_registry().get(cls.resource_type(), {}).get(ResourceRegistryKeys.MASK, BaseMask)
+        return get_resource_entry(cls.resource_type()).mask or BaseMask
 
     @classmethod
     def resource_type(cls):
         return cls.schema().resource_type()
 
     def resource_id(self):
-        return self.schema().resource_id().to_json(self)
+        return self.serialization_plan().id_to_json(self)
 
     @classmethod
     def route_prefix(cls):
@@ -124,6 +160,51 @@ class SchemaSerializer(JSONAPISerializer):
 
     # # Serialization
 
+    def as_json_api_data(self, version):
+        fragment_cache = self.fragment_cache
+        if fragment_cache is None:
+            return super().as_json_api_data(version)
+
+        fragment_key = self.fragment_key(version)
+        fragment = fragment_cache.get(fragment_key)
+        if fragment is None:
+            fragment = super().as_json_api_data(version)
+            fragment_cache.set(fragment_key, fragment)
+        return fragment
+
+    def as_json_api_data_bytes(self, version, encoder=None):
+        fragment_cache = self.fragment_cache
+        if fragment_cache is None:
+            return super().as_json_api_data_bytes(version, encoder)
+
+        # Encoded fragments are cached beside the decoded ones, so they are invalidated together
+        fragment_key = self.fragment_key(version) + ('encoded',)
+        encoded_fragment = fragment_cache.get(fragment_key)
+        if encoded_fragment is None:
+            encoded_fragment = super().as_json_api_data_bytes(version, encoder)
+            fragment_cache.set(fragment_key, encoded_fragment)
+        return encoded_fragment
+
+    def fragment_key(self, version):
+        """
+        The key under which `fragment_cache` stores this resource's `as_json_api_data` output.
+        Masks are accounted for by keying on the fields and relationships which are actually visible.
+        Relationship linkage is cached too, so e.g. a to-many relationship which changes
+        without its parent being invalidated is served stale until the fragment expires.
+        Override this in a subclass if the output also depends on e.g. `current_user_id`.
+
+        :param version: The JSON API version of the output
+        :return: A tuple beginning with the resource's (type, id)
+        """
+        plan = self.serialization_plan()
+        return (
+            plan.resource_type,
+            self.resource_id_str(),
+            version.value,
+            tuple(key for key, _ in plan.attributes if self.should_include_attribute(key)),
+            tuple(key for key, _ in plan.relationships if self.should_include_relationship(key)),
+        )
+
     # Included resources
 
     def linked_resources(self):
@@ -133,32 +214,57 @@ class SchemaSerializer(JSONAPISerializer):
         :return: A map from relationship names to the related resource
         """
         if self._linked_resources is None:
-            links = {}
-            relationship_keys = self.schema().relationships()
-            if relationship_keys:
-                for key in relationship_keys:
-                    if self.should_include_relationship(key):
-                        relationship = self.schema().relationship(key)
-                        links[key] = relationship.related_serializer(self, key)
-            self._linked_resources = links
+            included_relationships = [
+                (key, relationship)
+                for key, relationship in self.serialization_plan().relationships
+                if self.should_include_relationship(key)
+            ]
+            related_serializers = map_in_executor(
+                self.executor,
+                lambda included_relationship: included_relationship[1].related_serializer(self,
+                                                                                          included_relationship[0]),
+                included_relationships
+            )
+            # built in schema order, however the related serializers happened to resolve
+            self._linked_resources = {
+                key: related_serializer
+                for (key, _), related_serializer in zip(included_relationships, related_serializers)
+            }
         return self._linked_resources
 
+    def has_resolved_linked_resources(self):
+        return self._linked_resources is not None
+
+    @property
+    def includes(self):
+        """The dot-separated include paths for this resource, e.g. ['pledges.campaign.goals', 'campaign']"""
+        return self.include_tree.paths()
+
+    @includes.setter
+    def includes(self, includes):
+        self.include_tree = IncludeTree.from_includes(includes)
+
     def normalized_includes(self):
         # If includes passed in are e.g ['pledges.campaign.goals', 'campaign'] for a UserResource,
         # we want to include 'pledges' and 'campaign' here,
         # even tho the literal string 'pledges' is not in the self.includes array
-        return [include.split('.')[0]
-                for include in self.includes]
+        return list(self.include_tree.keys())
 
     def should_include_relationship(self, key):
         """
         Checks if the user requested the related resource and our Masks allow it.
+        As in the JSON API spec, a sparse fieldset for this type (`fields[type]=...`) covers relationships too,
+        so a relationship which isn't listed is neither fetched, primed nor serialized.
 
         :param key: The name by which the parent resource refers to the child resource
         :return: A boolean indicating whether or not the relationship matching the given key should be serialized
         """
-        if key not in self.normalized_includes():
+        if key not in self.include_tree:
             return False
+        if self.requested_fields is not None:
+            fields = self.requested_fields.get(self.serialization_plan().resource_type)
+            if fields is not None and key not in fields:
+                return False
         if self._masked_includes is None:
             self._masked_includes = self.mask_class().includes_cant_view(self.model, self.current_user_id)
         return key not in self._masked_includes
@@ -174,28 +280,20 @@ class SchemaSerializer(JSONAPISerializer):
         at initialization time, each sibling node primes the queries it will perform,
         so that when a node eventually performs the query, it can perform all the queries together
         (via our `https://github.com/Patreon/flask-caching-services` `MultigetCache` wrapper)
+
+        Related models are primed by `DocumentContext.prefetch_related_models` instead,
+        once the whole include depth is known, and only for relationships which will actually be included.
         """
         self.mask_class().prime_for_includes(self.model, self.current_user_id)
 
-        relationship_keys = self.schema().relationships()
-        if relationship_keys:
-            for key in relationship_keys:
-                # Often times checking should_include_relationship issues a query,
-                # but priming is cheap, so we over-prime rather than check self.should_include_relationship(key)
-                self.prime_schema_relationship(key)
-
     def prime_schema_relationship(self, key):
-        relationship_data_schema = self.schema().relationship(key)
-        relationship_type = None
-        id_attribute = None
-        if isinstance(relationship_data_schema, SchemaRelationship):
-            if not isinstance(relationship_data_schema, ArrayRelationship):
-                relationship_type = relationship_data_schema.model_type
-                id_attribute = relationship_data_schema.id_attribute
-
-        if relationship_type is not None and id_attribute is not None and hasattr(self.model, id_attribute):
-            relationship_model_get_primer = get_resource_registry().get(relationship_type) \
-                .get(ResourceRegistryKeys.MODEL_PRIME)
+        for primed_key, relationship_type, id_attribute in self.serialization_plan().primed_relationships:
+            if primed_key == key:
+                self._prime_relationship(relationship_type, id_attribute)
+
+    def _prime_relationship(self, relationship_type, id_attribute):
+        if hasattr(self.model, id_attribute):
+            relationship_model_get_primer = get_resource_entry(relationship_type).model_prime
             if relationship_model_get_primer is not None:
                 relationship_model_get_primer(getattr(self.model, id_attribute))
 
@@ -208,12 +306,9 @@ class SchemaSerializer(JSONAPISerializer):
         :return: A map from attribute names to their values
         """
         result = {}
-        attribute_keys = self.schema().attributes()
-        if attribute_keys:
-            for key in attribute_keys:
-                if self.should_include_attribute(key):
-                    attribute = self.schema().attribute(key)
-                    result[key] = attribute.to_json(self)
+        for key, to_json in self.serialization_plan().attributes:
+            if self.should_include_attribute(key):
+                result[key] = to_json(self)
         return result
 
     def should_include_attribute(self, key):
@@ -223,10 +318,11 @@ class SchemaSerializer(JSONAPISerializer):
         :param key: The name of the attribute of the resource
         :return: A boolean indicating whether or not the attribute matching the given key should be serialized
         """
-        if self.requested_fields is not None and self.resource_type() in self.requested_fields:
-            if key not in self.requested_fields[self.resource_type()]:
+        plan = self.serialization_plan()
+        if self.requested_fields is not None and plan.resource_type in self.requested_fields:
+            if key not in self.requested_fields[plan.resource_type]:
                 return False
-        elif key not in self.default_fields():
+        elif key not in plan.default_fields:
             return False
         if self._masked_fields is None:
             self._masked_fields = self.mask_class().fields_cant_view(self.model, self.current_user_id)
@@ -0,0 +1,55 @@
+from cartographer.field_types import ArrayRelationship, SchemaRelationship
+from cartographer.utils.include_tree import IncludeTree
+
+
+class SerializationPlan(object):
+    """
+    A `SerializationPlan` holds what serializing any model of a `SchemaSerializer` subclass reads from its schema
+    and its defaults, so that `SchemaSerializer.attributes_dictionary`, `resource_id`, `linked_resources` and
+    `prime_for_includes`, and `DocumentContext.pending_related_models`, don't go back to them for each model:
+    * `resource_type`, the JSON API `type` string
+    * `id_to_json`, the compiled accessor for the resource `id`
+    * `attributes`, a tuple of (key, compiled accessor) pairs in schema order
+    * `default_fields`, a frozenset of the attribute keys serialized when no sparse fieldset is requested
+    * `default_include_tree`, the `IncludeTree` of relationships serialized when no includes are requested
+    * `relationships`, a tuple of (key, `SchemaRelationship`) pairs in schema order
+    * `primed_relationships`, a tuple of (key, related type, foreign key column) triples
+    for the to-one relationships which `DocumentContext.prefetch_related_models` can fetch or prime
+
+    Get one from `SchemaSerializer.serialization_plan`.
+    """
+
+    __slots__ = ('resource_type', 'id_to_json', 'attributes', 'default_fields', 'default_include_tree',
+                 'relationships', 'primed_relationships')
+
+    def __init__(self, serializer_class):
+        schema = serializer_class.schema()
+
+        self.resource_type = serializer_class.resource_type()
+
+        id_attribute = schema.resource_id()
+        self.id_to_json = id_attribute.compiled_to_json() if id_attribute is not None else None
+
+        compiled_schema = schema.compiled_schema()
+        if compiled_schema is not None:
+            self.attributes = tuple(compiled_schema.attribute_accessors.items())
+        else:
+            self.attributes = tuple(
+                (key, schema.attribute(key).compiled_to_json())
+                for key in schema.attributes()
+            )
+        self.default_fields = frozenset(serializer_class.default_fields())
+        self.default_include_tree = IncludeTree.from_paths(serializer_class.default_includes())
+
+        self.relationships = tuple(
+            (key, schema.relationship(key))
+            for key in schema.relationships()
+        )
+        self.primed_relationships = tuple(
+            (key, relationship.model_type, relationship.id_attribute)
+            for key, relationship in self.relationships
+            if isinstance(relationship, SchemaRelationship) and
+            not isinstance(relationship, ArrayRelationship) and
+            relationship.model_type is not None and
+            relationship.id_attribute is not None
+        )
@@ -0,0 +1,129 @@
+from cartographer.utils.version import JSONAPIVersion
+
+
+class JSONAPIVersionStrategy(object):
+    """
+    A `JSONAPIVersionStrategy` holds everything about the JSON API output which differs between versions,
+    so that serializers look their version's strategy up once instead of re-branching on the version
+    in every method of every resource.
+    """
+
+    version = None
+    included_resources_key = None
+    related_url_key = None
+
+    def link_json(self, linkage_json):
+        """
+        :param linkage_json: The resource's {"type": ..., "id": ...} linkage, which must not be modified
+        :return: A new relationship object holding the linkage
+        """
+        raise NotImplementedError()
+
+    def null_link_json(self):
+        """:return: A new relationship object for an empty to-one relationship"""
+        raise NotImplementedError()
+
+    def resource_json(self, attributes, resource_id, resource_type, links):
+        """
+        :param attributes: The resource's `attributes_dictionary`, which may be modified
+        :param resource_id: The resource's id string
+        :param resource_type: The resource's type string
+        :param links: The resource's relationship objects, by relationship name
+        :return: The resource object
+        """
+        raise NotImplementedError()
+
+    def collection_link_json(self, collection):
+        """
+        :param collection: A `JSONAPICollectionSerializer`
+        :return: A new relationship object linking to each of the collection's members
+        """
+        raise NotImplementedError()
+
+
+class RC2Strategy(JSONAPIVersionStrategy):
+    version = JSONAPIVersion.JSONAPI_RC2
+    included_resources_key = "linked"
+    related_url_key = "resource"
+
+    def link_json(self, linkage_json):
+        return dict(linkage_json)
+
+    def null_link_json(self):
+        return {"id": None}
+
+    def resource_json(self, attributes, resource_id, resource_type, links):
+        attributes["id"] = resource_id
+        attributes["type"] = resource_type
+        if links:
+            attributes["links"] = links
+        return attributes
+
+    def collection_link_json(self, collection):
+        return collection.as_link_json_rc2(self.version)
+
+
+class RC3Strategy(RC2Strategy):
+    version = JSONAPIVersion.JSONAPI_RC3
+    included_resources_key = "included"
+    related_url_key = "related"
+
+    def link_json(self, linkage_json):
+        return {"linkage": linkage_json}
+
+    def null_link_json(self):
+        return {"linkage": None}
+
+    def collection_link_json(self, collection):
+        link_json = {"linkage": collection.as_linkage_json()}
+        link_json.update(collection.relationship_urls_json(self.version))
+        meta = collection.meta()
+        if meta is not None:
+            link_json["meta"] = meta
+        return link_json
+
+
+class V1Strategy(JSONAPIVersionStrategy):
+    version = JSONAPIVersion.JSONAPI_1_0
+    included_resources_key = "included"
+    related_url_key = "related"
+
+    def link_json(self, linkage_json):
+        return {"data": linkage_json}
+
+    def null_link_json(self):
+        return {"data": None}
+
+    def resource_json(self, attributes, resource_id, resource_type, links):
+        attributes.pop("id", None)
+        json = {"attributes": attributes, "id": resource_id, "type": resource_type}
+        if links:
+            json["relationships"] = links
+        return json
+
+    def collection_link_json(self, collection):
+        link_json = {"data": collection.as_linkage_json()}
+        links = collection.relationship_urls_json(self.version)
+        if links:
+            link_json["links"] = links
+        meta = collection.meta()
+        if meta is not None:
+            link_json["meta"] = meta
+        return link_json
+
+
+_VERSION_STRATEGIES = {
+    strategy.version: strategy
+    for strategy in [RC2Strategy(), RC3Strategy(), V1Strategy()]
+}
+
+
+def get_version_strategy(version):
+    """
+    :param version: A `JSONAPIVersion`
+    :return: The `JSONAPIVersionStrategy` which builds output for that version
+    """
+    try:
+        return _VERSION_STRATEGIES[version]
+    except KeyError:
+        raise ValueError("Unknown JSON API version")
@@ -1 +1,9 @@
 api_server = None
+
+# Whether related resources include only what the request asked of them, rather than their `default_includes`.
+# Serializer classes can override this with their own `strict_includes`.
+strict_includes = False
+
+# A function called with the top-level serializer and the number of default-included relationships
+# which `strict_includes` kept from being expanded, after each document where that number isn't 0
+suppressed_default_includes_hook = None
@@ -0,0 +1,76 @@
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_FLASK_INSTALLED = importlib.util.find_spec("flask") is not None
+
+DEFAULT_MAX_WORKERS = 8
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+def default_executor():
+    """
+    :return: A bounded `ThreadPoolExecutor` shared by every serializer which opts into it, created on first use
+    """
+    global _default_executor
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                                       thread_name_prefix='cartographer')
+    return _default_executor
+
+
+def map_in_executor(executor, function, items):
+    """
+    Calls `function` on each item, in parallel on `executor` if one is given.
+    Results are returned in the order of `items`, however the calls happen to finish,
+    and the first exception raised by a call is re-raised here.
+
+    Calls made from inside one of these calls run inline, rather than waiting on the executor,
+    so that nested fan-outs can't deadlock a bounded pool by waiting on work queued behind themselves.
+    The current flask app and request contexts, if any, are pushed in the worker threads.
+
+    :param executor: A `concurrent.futures.Executor`, or None to call `function` serially
+    :param function: A function of one item
+    :param items: The items
+    :return: A list of `function`'s return values
+    """
+    items = list(items)
+    if executor is None or len(items) < 2 or getattr(_worker_state, 'active', False):
+        return [function(item) for item in items]
+
+    futures = [executor.submit(_in_worker, _with_flask_context(function), item) for item in items]
+    return [future.result() for future in futures]
+
+
+def _in_worker(function, item):
+    _worker_state.active = True
+    try:
+        return function(item)
+    finally:
+        _worker_state.active = False
+
+
+def _with_flask_context(function):
+    if not _FLASK_INSTALLED:
+        return function
+
+    import flask
+    if flask.has_request_context():
+        # called once per submitted item, since one copy of the request context can't be pushed in several threads
+        return flask.copy_current_request_context(function)
+
+    if flask.has_app_context():
+        app = flask.current_app._get_current_object()
+
+        def call_in_app_context(item):
+            with app.app_context():
+                return function(item)
+
+        return call_in_app_context
+
+    return function
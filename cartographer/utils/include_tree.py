@@ -0,0 +1,93 @@
+class IncludeTree(object):
+    """
+    `IncludeTree` is a trie of JSON API include paths.
+    For example, `['author', 'comments.author']` becomes
+
+    ```
+    author
+    comments
+    └── author
+    ```
+
+    The tree is built once per request and never modified afterwards,
+    so a parent serializer hands each child `subtree(relationship_name)` by reference
+    rather than re-filtering a list of path strings,
+    and checking whether a relationship is included is a single dict lookup.
+    """
+
+    __slots__ = ('children',)
+
+    def __init__(self, children=None):
+        """
+        :param children: A map from relationship names to their own `IncludeTree`s
+        """
+        self.children = children if children is not None else {}
+
+    @classmethod
+    def from_paths(cls, include_paths):
+        """
+        :param include_paths: An iterable of dot-separated include paths, e.g. `['pledges.campaign', 'campaign']`
+        :return: The `IncludeTree` containing each of those paths
+        """
+        nested_paths = {}
+        for include_path in include_paths:
+            node = nested_paths
+            for step in include_path.split('.'):
+                node = node.setdefault(step, {})
+        return cls._from_nested_paths(nested_paths)
+
+    @classmethod
+    def _from_nested_paths(cls, nested_paths):
+        if not nested_paths:
+            return EMPTY_INCLUDE_TREE
+        return cls({
+            step: cls._from_nested_paths(nested_steps)
+            for step, nested_steps in nested_paths.items()
+        })
+
+    @classmethod
+    def from_includes(cls, includes):
+        """
+        :param includes: An `IncludeTree`, a list of include path strings, or None
+        :return: `includes` as an `IncludeTree`, or None if `includes` was None
+        """
+        if includes is None or isinstance(includes, IncludeTree):
+            return includes
+        return cls.from_paths(includes)
+
+    def __contains__(self, relationship_name):
+        return relationship_name in self.children
+
+    def __bool__(self):
+        return bool(self.children)
+
+    def __len__(self):
+        return len(self.children)
+
+    def __repr__(self):
+        return 'IncludeTree({!r})'.format(self.paths())
+
+    def keys(self):
+        return self.children.keys()
+
+    def subtree(self, relationship_name):
+        """
+        :param relationship_name: The name of an included relationship
+        :return: The includes requested beneath that relationship, which are empty if none were requested
+        """
+        return self.children.get(relationship_name, EMPTY_INCLUDE_TREE)
+
+    def paths(self):
+        """
+        :return: The list of dot-separated paths to each leaf of this tree
+        """
+        paths = []
+        for step, subtree in self.children.items():
+            if subtree:
+                paths.extend(step + '.' + path for path in subtree.paths())
+            else:
+                paths.append(step)
+        return paths
+
+
+EMPTY_INCLUDE_TREE = IncludeTree()
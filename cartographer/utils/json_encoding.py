@@ -0,0 +1,44 @@
+import importlib.util
+import json
+
+
+def stdlib_json_encoder(json_data):
+    return json.dumps(json_data, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_encoder(json_data):
+    return _orjson.dumps(json_data, option=_orjson.OPT_NON_STR_KEYS)
+
+
+def ujson_encoder(json_data):
+    return _ujson.dumps(json_data, ensure_ascii=False).encode('utf-8')
+
+
+if importlib.util.find_spec("orjson") is not None:
+    import orjson as _orjson
+    _DEFAULT_JSON_ENCODER = orjson_encoder
+elif importlib.util.find_spec("ujson") is not None:
+    import ujson as _ujson
+    _DEFAULT_JSON_ENCODER = ujson_encoder
+else:
+    _DEFAULT_JSON_ENCODER = stdlib_json_encoder
+
+_JSON_ENCODER = _DEFAULT_JSON_ENCODER
+
+
+def get_json_encoder():
+    """
+    :return: The function used to encode JSON API output,
+    which takes JSON-compatible Python data and returns UTF-8 encoded bytes.
+    Defaults to the fastest installed of `orjson`, `ujson` and the stdlib `json`.
+    """
+    return _JSON_ENCODER
+
+
+def set_json_encoder(encoder):
+    """
+    :param encoder: A function taking JSON-compatible Python data and returning UTF-8 encoded bytes,
+    or None to restore the default
+    """
+    global _JSON_ENCODER
+    _JSON_ENCODER = encoder or _DEFAULT_JSON_ENCODER
@@ -0,0 +1,144 @@
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LONGEST_PARTIAL_TOKEN = 8
+# the characters a number may continue with, e.g. `1` continuing as `1.5e-3`
+_NUMBER_CONTINUATION = re.compile(r'[0-9.eE+\-]*')
+
+
+class JSONStreamReader(object):
+    """
+    An incremental JSON tokenizer over a binary stream, such as an inbound request body.
+
+    It walks the outer structure of the document one token at a time,
+    and decodes each value only once it has been read in full,
+    so that e.g. the members of a huge top-level array can be handled one at a time.
+    At most one chunk plus the value currently being decoded is held in memory.
+    """
+
+    def __init__(self, stream, chunk_size=64 * 1024):
+        """
+        :param stream: A file-like object whose `read(size)` returns UTF-8 encoded bytes
+        :param chunk_size: The number of bytes read from the stream at a time
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._position = 0
+        self._is_exhausted = False
+
+    def peek(self):
+        """:return: The next non-whitespace character, without consuming it, or None at the end of the stream"""
+        while True:
+            self._position = _WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return None
+
+    def expect(self, character):
+        """Consumes the next non-whitespace character, which must be `character`"""
+        if self.peek() != character:
+            raise self._error("Expecting '{}'".format(character))
+        self._position += 1
+
+    def read_value(self):
+        """:return: The next JSON value, decoded in full"""
+        self.peek()
+        read_size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError as e:
+                if not self._is_truncation(e) or not self._fill(read_size):
+                    raise
+                # grow the reads, so that a value spanning many chunks isn't re-decoded once per chunk
+                read_size *= 2
+                continue
+            if self._may_continue(value, end) and self._fill(read_size):
+                continue
+            self._position = end
+            return value
+
+    def iter_object_keys(self):
+        """
+        Yields each key of the next JSON object.
+        The caller must consume the key's value, with `read_value` or `iter_array_items`, before resuming.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._position += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("Expecting property name enclosed in double quotes")
+            self.expect(':')
+            yield key
+            next_character = self.peek()
+            self._position += 1
+            if next_character == '}':
+                return
+            if next_character != ',':
+                self._position -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def iter_array_items(self):
+        """Yields each item of the next JSON array, decoded in full"""
+        self.expect('[')
+        if self.peek() == ']':
+            self._position += 1
+            return
+        while True:
+            yield self.read_value()
+            next_character = self.peek()
+            self._position += 1
+            if next_character == ']':
+                return
+            if next_character != ',':
+                self._position -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _fill(self, read_size=None):
+        """
+        Drops the consumed part of the buffer and reads the next chunk into it.
+
+        :return: Whether anything more was read
+        """
+        if self._is_exhausted:
+            return False
+        chunk = self.stream.read(read_size or self.chunk_size)
+        if not chunk:
+            self._is_exhausted = True
+        text = self._text_decoder.decode(chunk, final=self._is_exhausted)
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        return bool(text) or not self._is_exhausted
+
+    def _may_continue(self, value, end):
+        """
+        :return: Whether the value just decoded may only be the start of a longer one,
+        i.e. it reaches the end of the buffer, or it's a number followed only by what could be more of that number
+        (`1` of `1.5`, or `-2.5` of `-2.5e10`), up to the end of the buffer
+        """
+        if end == len(self._buffer):
+            return True
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return _NUMBER_CONTINUATION.match(self._buffer, end).end() == len(self._buffer)
+        return False
+
+    def _is_truncation(self, error):
+        """
+        :return: Whether the decoding error may just be the value running past the end of the buffer,
+        rather than invalid JSON, which is raised without reading the rest of the stream
+        """
+        # partial numbers, literals and escapes fail within a few characters of the end
+        return error.pos >= len(self._buffer) - _LONGEST_PARTIAL_TOKEN or error.msg.startswith('Unterminated string')
+
+    def _error(self, message):
+        return json.JSONDecodeError(message, self._buffer, self._position)
@@ -0,0 +1,182 @@
+import json
+import re
+from collections.abc import Mapping
+from json.decoder import scanstring
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["{}\[\]]')
+# a run of anything but brackets, where brackets inside strings don't count
+_FLAT = r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*'
+_SCALAR = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|-?Infinity')
+
+_decoder = json.JSONDecoder()
+
+
+def _container_pattern(max_depth):
+    """
+    :return: A pattern matching a whole array or object nested at most `max_depth` deep, brackets inside strings aside,
+    so that the regex engine can skip it without a Python loop over its brackets
+    """
+    content = _FLAT
+    for _ in range(max_depth - 1):
+        content = _FLAT + r'(?:[\[{]' + content + r'[\]}]' + _FLAT + r')*'
+    return re.compile(r'[\[{]' + content + r'[\]}]')
+
+
+_CONTAINER = _container_pattern(max_depth=8)
+
+
+def lazy_json_loads(raw_json):
+    """
+    :param raw_json: A JSON document, as UTF-8 encoded bytes or as a string
+    :return: The document's top-level value, where every JSON object is a read-only `LazyJSONObject`
+    """
+    text = raw_json.decode('utf-8') if isinstance(raw_json, (bytes, bytearray)) else raw_json
+    return _decode_at(text, _WHITESPACE.match(text).end())
+
+
+class LazyJSONObject(Mapping):
+    """
+    A read-only JSON object over the raw text of a document, which decodes its members only when first accessed.
+
+    The first lookup scans the object's keys, skipping over values by matching their brackets without building them;
+    each value is then decoded on first access, with nested objects being lazy in turn.
+    Arrays are decoded into lists when accessed, so that `isinstance(value, list)` keeps working,
+    but the objects inside them stay lazy.
+    Like `json.loads`, an object with duplicate keys resolves to the last.
+    Invalid JSON is only detected in the parts of the document which are actually read.
+    """
+
+    __slots__ = ('_text', '_start', '_value_starts', '_values')
+
+    def __init__(self, text, start):
+        """
+        :param text: The whole JSON document
+        :param start: The index of this object's opening brace in `text`
+        """
+        self._text = text
+        self._start = start
+        self._value_starts = None
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        value = _decode_at(self._text, self._scan()[key])
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._scan()
+
+    def __iter__(self):
+        return iter(self._scan())
+
+    def __len__(self):
+        return len(self._scan())
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self.items()))
+
+    def _scan(self):
+        """:return: A map from each of the object's keys to the index where its last value begins"""
+        if self._value_starts is not None:
+            return self._value_starts
+
+        text = self._text
+        value_starts = {}
+        position = _WHITESPACE.match(text, self._start + 1).end()
+        if not text.startswith('}', position):
+            while True:
+                if not text.startswith('"', position):
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, position)
+                member_key, position = scanstring(text, position + 1)
+                position = _WHITESPACE.match(text, position).end()
+                if not text.startswith(':', position):
+                    raise json.JSONDecodeError("Expecting ':' delimiter", text, position)
+                position = _WHITESPACE.match(text, position + 1).end()
+                value_starts[member_key] = position
+                position = _WHITESPACE.match(text, _skip_value(text, position)).end()
+                if text.startswith('}', position):
+                    break
+                if not text.startswith(',', position):
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, position)
+                position = _WHITESPACE.match(text, position + 1).end()
+
+        self._value_starts = value_starts
+        return value_starts
+
+
+def _decode_at(text, start):
+    if start >= len(text):
+        raise json.JSONDecodeError("Expecting value", text, start)
+    character = text[start]
+    if character == '{':
+        return LazyJSONObject(text, start)
+    if character == '[':
+        return _decode_array(text, start)[0]
+    return _decoder.raw_decode(text, start)[0]
+
+
+def _decode_array(text, start):
+    """:return: The array at `start` as a list with lazy objects, and the index just past it"""
+    items = []
+    position = _WHITESPACE.match(text, start + 1).end()
+    if text.startswith(']', position):
+        return items, position + 1
+    while True:
+        if text.startswith('{', position):
+            items.append(LazyJSONObject(text, position))
+            position = _skip_value(text, position)
+        elif text.startswith('[', position):
+            item, position = _decode_array(text, position)
+            items.append(item)
+        else:
+            item, position = _decoder.raw_decode(text, position)
+            items.append(item)
+        position = _WHITESPACE.match(text, position).end()
+        if text.startswith(']', position):
+            return items, position + 1
+        if not text.startswith(',', position):
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, position)
+        position = _WHITESPACE.match(text, position + 1).end()
+
+
+def _skip_value(text, start):
+    """
+    Finds the end of the value at `start` without decoding it: strings are scanned, containers are skipped
+    by matching their brackets, and scalars by their syntax. Containers' contents aren't checked any further.
+
+    :return: The index just past the value
+    """
+    if text.startswith('"', start):
+        return scanstring(text, start + 1)[1]
+    if not text.startswith(('{', '['), start):
+        match = _SCALAR.match(text, start)
+        if match is None:
+            raise json.JSONDecodeError("Expecting value", text, start)
+        return match.end()
+
+    match = _CONTAINER.match(text, start)
+    if match is not None:
+        return match.end()
+
+    # nested deeper than `_CONTAINER` handles
+    depth = 0
+    position = start
+    while True:
+        match = _STRUCTURE.search(text, position)
+        if match is None:
+            raise json.JSONDecodeError("Unterminated container", text, start)
+        position = match.end()
+        character = match.group()
+        if character == '"':
+            position = scanstring(text, position)[1]
+        elif character in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return position
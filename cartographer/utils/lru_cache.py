@@ -0,0 +1,72 @@
+import time
+from collections import OrderedDict
+from threading import RLock
+
+
+class LRUCache(object):
+    """
+    A bounded, thread-safe map which evicts its least recently used entries,
+    and optionally expires entries a fixed number of seconds after they were set.
+    """
+
+    def __init__(self, max_entries, ttl_seconds=None, on_evict=None, clock=time.monotonic):
+        """
+        :param max_entries: The number of entries kept before the least recently used is evicted
+        :param ttl_seconds: The number of seconds after which an entry expires, or None to never expire entries
+        :param on_evict: A function called with the key of each entry which is evicted, expired, or deleted
+        :param clock: A function returning the current time in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self.clock = clock
+
+        self._entries = OrderedDict()
+        # held while `on_evict` runs; callers may hold it too, to update their own state along with the cache's
+        self.lock = RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self.clock():
+                self._remove(key)
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = self.clock() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self.lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self.lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def _remove(self, key):
+        del self._entries[key]
+        if self.on_evict is not None:
+            self.on_evict(key)
+
+
+_MISSING = object()
@@ -1,3 +1,4 @@
+from cartographer.resources import get_resource_registry_container
 from flask import Flask, jsonify, make_response
 from generic_social_network.app.models.flask.my_request import MyRequest
 from generic_social_network.app.models.flask.my_session import MySessionInterface
@@ -21,6 +22,9 @@ my_app.register_blueprint(follows_controller.follows_blueprint)
 my_app.register_blueprint(news_feed_controller.news_feed_blueprint)
 my_app.register_blueprint(test_data_controller.test_data_blueprint)
 
+# every resource has been imported by the controllers, so verify and compile them all up front
+get_resource_registry_container().compile()
+
 
 # set up error handling
 def json_error_description(error_):
@@ -1,10 +1,11 @@
 #!flask/bin/python
 from cartographer.serializers import JSONAPICollectionSerializer
-from flask import jsonify, abort, request, Blueprint
+from flask import abort, request, Blueprint
 from generic_social_network.app import db
 from generic_social_network.app.models.query_builders.follows_dbm import FollowsDBM
 from generic_social_network.app.models.query_builders.users_dbm import UsersDBM
 from generic_social_network.app.resources.follow_resource import FollowSerializer
+from generic_social_network.app.services.json_responses import json_bytes_response, streamed_json_response
 
 follows_blueprint = Blueprint('follows_blueprint', __name__)
 follows_dbm = FollowsDBM(db)
@@ -32,13 +33,13 @@ def read_follow(follower_id, followed_id):
 
 
 def list_follows(request_):
-    return jsonify(JSONAPICollectionSerializer([
+    return streamed_json_response(JSONAPICollectionSerializer([
         FollowSerializer(
             follow,
             inbound_request=request_
         )
         for follow in follows_dbm.all()
-    ]).as_json_api_document())
+    ]).iter_json_api_document())
 
 
 def delete_follow(request_, follower_id, followed_id):
@@ -72,4 +73,4 @@ def get_follow_or_404(follower_id, followed_id):
 
 
 def success_with_follow(follow):
-    return jsonify(FollowSerializer(follow).as_json_api_document())
+    return json_bytes_response(FollowSerializer(follow).as_json_api_bytes())
@@ -8,6 +8,7 @@ from generic_social_network.app.models.query_builders.users_dbm import UsersDBM
 
 from generic_social_network.app.models.query_builders.follows_dbm import FollowsDBM
 from generic_social_network.app.resources.post_resource import PostSerializer
+from generic_social_network.app.services.json_responses import streamed_json_response
 
 news_feed_blueprint = Blueprint('news_feed_blueprint', __name__)
 follows_dbm = FollowsDBM(db)
@@ -20,14 +21,14 @@ user_read_history_dbm = UserReadHistoryDBM(db)
 def read_news_feed(user_id):
     user = get_user_or_404(user_id)
     posts = posts_dbm.find_posts_for_follower(user_id)
-    return jsonify(JSONAPICollectionSerializer([
+    return streamed_json_response(JSONAPICollectionSerializer([
         PostSerializer(
             post,
             inbound_request=request,
             inbound_session=session
         )
         for post in posts
-    ]).as_json_api_document())
+    ]).iter_json_api_document())
 
 
 def get_user_or_404(post_id):
@@ -1,15 +1,21 @@
 #!flask/bin/python
+from cartographer.exceptions.request_exceptions import BulkDataInvalid, DataMissing, JSONAPIException
+from cartographer.parsers.streaming_jsonapi_parser import StreamingPostedDocument
 from cartographer.serializers import JSONAPICollectionSerializer
-from flask import jsonify, abort, request, Blueprint
+from flask import abort, jsonify, request, Blueprint
+from werkzeug.exceptions import HTTPException
 from generic_social_network.app import db
 from generic_social_network.app.models.query_builders.posts_dbm import PostsDBM
 from generic_social_network.app.models.query_builders.users_dbm import UsersDBM
 from generic_social_network.app.resources.post_resource import PostSerializer, PostParser
+from generic_social_network.app.services.json_responses import json_bytes_response, streamed_json_response
 
 posts_blueprint = Blueprint('posts_blueprint', __name__)
 posts_dbm = PostsDBM(db)
 users_dbm = UsersDBM(db)
 
+IMPORT_BATCH_SIZE = 500
+
 
 @posts_blueprint.route('/posts/<int:post_id>', methods=['POST', 'GET', 'PUT', 'DELETE'])
 def route_post(post_id):
@@ -26,24 +32,33 @@ def route_post(post_id):
 @posts_blueprint.route('/posts', methods=['POST', 'GET'])
 def route_posts():
     if request.method == 'POST':
+        # anything but a bulk upload is left for the parser to reject
+        body = request.get_json(force=True, silent=True)
+        if isinstance(body, dict) and isinstance(body.get('data'), list):
+            return create_posts(request)
         return create_post(request, None)
     else:
         return list_posts(request)
 
 
+@posts_blueprint.route('/posts/import', methods=['POST'])
+def route_posts_import():
+    return import_posts(request)
+
+
 def read_post(post_id):
     post = get_post_or_404(post_id)
     return success_with_post(post)
 
 
 def list_posts(request_):
-    return jsonify(JSONAPICollectionSerializer([
+    return streamed_json_response(JSONAPICollectionSerializer([
         PostSerializer(
             post,
             inbound_request=request_
         )
         for post in posts_dbm.all()
-    ]).as_json_api_document())
+    ]).iter_json_api_document())
 
 
 def delete_post(request_, post_id):
@@ -75,6 +90,68 @@ def create_post(request_, post_id):
     return success_with_post(post), 201
 
 
+def create_posts(request_):
+    parser = PostParser(inbound_request=request_)
+    try:
+        rows = parser.validated_table_data_many()
+    except BulkDataInvalid as e:
+        abort(400, e.error_description)
+
+    for resource, row in zip(parser.data_many(), rows):
+        if resource.json_data.get('id') is None:
+            abort(400, 'Each provided post object must have an id')
+        row['post_id'] = post_id_or_abort(resource)
+    post_ids = [row['post_id'] for row in rows]
+    if posts_dbm.find_by_ids(post_ids):
+        abort(409, 'Some of the provided posts already exist')
+
+    posts_dbm.create_many_from_json(rows)
+    return json_bytes_response(JSONAPICollectionSerializer([
+        PostSerializer(post, inbound_request=request_)
+        for post in posts_dbm.find_by_ids(post_ids)
+    ]).as_json_api_bytes()), 201
+
+
+def import_posts(request_):
+    """Creates every post in a bulk upload, reading and inserting it in batches rather than all at once"""
+    document = StreamingPostedDocument(request_.stream, version=request_.get_json_api_version())
+    parser = PostParser(json_data=document.json_data, inbound_request=request_)
+    imported_count = 0
+    batch = []
+    try:
+        for resource, row in parser.iter_validated_table_data_many(document.iter_data()):
+            if resource.json_data.get('id') is not None:
+                row['post_id'] = post_id_or_abort(resource)
+            batch.append(row)
+            if len(batch) == IMPORT_BATCH_SIZE:
+                posts_dbm.insert_many_from_json(batch)
+                imported_count += len(batch)
+                batch = []
+        if batch:
+            posts_dbm.insert_many_from_json(batch)
+            imported_count += len(batch)
+    except BulkDataInvalid as e:
+        db.session.rollback()
+        abort(400, e.error_description)
+    except DataMissing:
+        db.session.rollback()
+        abort(400, 'No post data was provided in your request')
+    except ValueError as e:
+        db.session.rollback()
+        abort(400, 'Provided document was not valid JSON: {0}'.format(e))
+
+    db.session.commit()
+    return jsonify({'meta': {'imported': imported_count}}), 201
+
+
+def post_id_or_abort(resource):
+    try:
+        return int(resource.json_data['id'])
+    except ValueError:
+        db.session.rollback()
+        abort(400, 'Provided post id {0} was not an integer'.format(resource.json_data['id']))
+
+
 def get_post_or_404(post_id):
     post = posts_dbm.find_by_id(post_id)
     if post is None:
@@ -85,12 +162,16 @@ def get_post_or_404(post_id):
 def success_with_post(post, request_=None):
     if request_ is None:
         request_ = request
-    return jsonify(PostSerializer(post, inbound_request=request_).as_json_api_document())
+    return json_bytes_response(PostSerializer(post, inbound_request=request_).as_json_api_bytes())
 
 
 def validate_inbound_post(request_, post_id, post_found_behavior):
     try:
         table_data = PostParser(inbound_request=request_).validated_table_data()
+    except HTTPException:  # e.g. the body wasn't JSON
+        raise
+    except JSONAPIException as e:
+        abort(400, e.error_description or e.error_title)
     except Exception as e:
         abort(400, ', '.join(e.args))
     table_data = standardize_post_ids_or_abort(table_data, post_id)
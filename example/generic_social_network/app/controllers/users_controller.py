@@ -1,10 +1,11 @@
 #!flask/bin/python
 from cartographer.serializers import JSONAPICollectionSerializer
-from flask import jsonify, abort, request, Blueprint
+from flask import abort, request, Blueprint
 from generic_social_network.app import db
 
 from generic_social_network.app.models.query_builders.users_dbm import UsersDBM
 from generic_social_network.app.resources.user_resource import UserSerializer, UserParser
+from generic_social_network.app.services.json_responses import json_bytes_response, streamed_json_response
 
 users_blueprint = Blueprint('users_blueprint', __name__)
 users_dbm = UsersDBM(db)
@@ -36,13 +37,13 @@ def read_user(user_id):
 
 
 def list_users(request_):
-    return jsonify(JSONAPICollectionSerializer([
+    return streamed_json_response(JSONAPICollectionSerializer([
         UserSerializer(
             user,
             inbound_request=request_
         )
         for user in users_dbm.all()
-    ]).as_json_api_document())
+    ]).iter_json_api_document())
 
 
 def delete_user(user_id):
@@ -105,4 +106,4 @@ def standardize_user_ids_or_abort(json, user_id):
 
 
 def success_with_user(user):
-    return jsonify(UserSerializer(user).as_json_api_document())
+    return json_bytes_response(UserSerializer(user).as_json_api_bytes())
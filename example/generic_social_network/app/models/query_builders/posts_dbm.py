@@ -20,6 +20,9 @@ class PostsDBM:
             return matching[0]
         raise Exception
 
+    def find_by_ids(self, ids):
+        return Post.query.filter(Post.post_id.in_(ids)).order_by(Post.post_id).all()
+
     def find_by_title(self, title):
         return Post.query.filter_by(title=title).all()
 
@@ -36,6 +39,14 @@ class PostsDBM:
         Post.insert(json)
         self.db.session.commit()
 
+    def create_many_from_json(self, jsons):
+        self.insert_many_from_json(jsons)
+        self.db.session.commit()
+
+    def insert_many_from_json(self, jsons):
+        """Inserts without committing, so that several batches can be written in one transaction"""
+        Post.insert(jsons)
+
     def update_from_json(self, json):
         Post.insert_on_duplicate_key_update(json)
         self.db.session.commit()
@@ -3,7 +3,7 @@ from flask_sqlalchemy import Model
 from sqlalchemy import inspect
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql.expression import Insert
-from generic_social_network.app.services.caching import clear_request_cache
+from generic_social_network.app.services.caching import clear_request_cache, invalidate_fragments_when_transaction_ends
 
 
 class InsertOnDuplicate(Insert):
@@ -98,10 +98,35 @@ class MyModel(Model):
 
         return working_query
 
+    @classmethod
+    def __clear_caches(cls, written_rows):
+        from generic_social_network.app import db
+
+        clear_request_cache()
+
+        primary_keys = cls.__get_primary_keys()
+        if isinstance(written_rows, dict):
+            written_rows = [written_rows]
+        for row in written_rows:
+            if len(primary_keys) == 1 and row.get(primary_keys[0]) is not None:
+                invalidate_fragments_when_transaction_ends(db.session, cls, str(row[primary_keys[0]]))
+            else:
+                invalidate_fragments_when_transaction_ends(db.session, cls)
+
     @classmethod
     def get(cls, *args, **kwargs):
         return cls.__get(*args, **kwargs).first()
 
+    @classmethod
+    def get_many(cls, ids):
+        primary_keys = cls.__get_primary_keys()
+        if len(primary_keys) != 1:
+            raise Exception("get_many requires a single primary key for " + cls.__name__)
+
+        primary_key = primary_keys[0]
+        models = cls.query.filter(getattr(cls, primary_key).in_(ids)).all()
+        return {getattr(model, primary_key): model for model in models}
+
     @classmethod
     def get_with_lock(cls, *args, **kwargs):
         return cls.__get(*args, **kwargs).with_for_update().first()
@@ -125,7 +150,7 @@ class MyModel(Model):
     def insert(cls, insert_values):
         from generic_social_network.app import db
 
-        clear_request_cache()
+        cls.__clear_caches(insert_values)
         result = db.session.execute(cls.__table__.insert().values(insert_values))
         return cls.primary_key_from_insert_or_update(result)
 
@@ -133,7 +158,7 @@ class MyModel(Model):
     def insert_ignore(cls, insert_values):
         from generic_social_network.app import db
 
-        clear_request_cache()
+        cls.__clear_caches(insert_values)
         result = db.session.execute(
             cls.__table__.insert(prefixes=['ignore']).values(insert_values))
         return cls.primary_key_from_insert_or_update(result)
@@ -142,15 +167,15 @@ class MyModel(Model):
     def insert_on_duplicate_key_update(cls, insert_values):
         from generic_social_network.app import db
 
-        clear_request_cache()
+        cls.__clear_caches(insert_values)
         insert_operation = cls.__table__.insert().prefix_with("OR REPLACE").values(insert_values)
         result = db.session.execute(insert_operation)
         return cls.primary_key_from_insert_or_update(result)
 
     def delete(self):
-        clear_request_cache()
+        self.__clear_caches(self.__get_primary_key_dict())
         self.query.filter_by(**self.__get_primary_key_dict()).delete()
 
     def update(self, update_values):
-        clear_request_cache()
+        self.__clear_caches(self.__get_primary_key_dict())
         self.query.filter_by(**self.__get_primary_key_dict()).update(update_values)
\ No newline at end of file
@@ -4,6 +4,7 @@ from cartographer.resources.api_resource import APIResource
 from cartographer.schemas.schema import Schema
 from cartographer.serializers import SchemaSerializer
 from generic_social_network.app.models.tables.post import Post, PostType
+from generic_social_network.app.services.caching import fragment_cache
 
 
 class PostSchema(Schema):
@@ -30,6 +31,8 @@ class PostSchema(Schema):
 
 
 class PostSerializer(SchemaSerializer):
+    fragment_cache = fragment_cache
+
     @classmethod
     def schema(cls):
         return PostSchema
@@ -43,9 +46,9 @@ class PostParser(SchemaParser):
     def validate(self, inbound_data):
         super().validate(inbound_data)
         if not (inbound_data.relationship_id('author') and inbound_data.relationship_id('author').resource_id()):
-            raise Exception("Provided post object was missing the author id field")
+            raise ValueError("Provided post object was missing the author id field")
         if not inbound_data.attribute('body'):
-            raise Exception("Provided post object was missing the body field")
+            raise ValueError("Provided post object was missing the body field")
 
 
 class PostResource(APIResource):
@@ -55,4 +58,5 @@ class PostResource(APIResource):
     # MASK = BaseMask
     MODEL = Post
     MODEL_GET = Post.get
+    MODEL_GET_MANY = Post.get_many
     # MODEL_PRIME = Post.get.prime
@@ -4,6 +4,7 @@ from cartographer.resources.api_resource import APIResource
 from cartographer.schemas.schema import Schema
 from cartographer.serializers import SchemaSerializer
 from generic_social_network.app.models.tables.user import User
+from generic_social_network.app.services.caching import fragment_cache
 
 
 class UserSchema(Schema):
@@ -21,6 +22,8 @@ class UserSchema(Schema):
 
 
 class UserSerializer(SchemaSerializer):
+    fragment_cache = fragment_cache
+
     @classmethod
     def schema(cls):
         return UserSchema
@@ -44,4 +47,5 @@ class UserResource(APIResource):
     # MASK = BaseMask
     MODEL = User
     MODEL_GET = User.get
+    MODEL_GET_MANY = User.get_many
     # MODEL_PRIME = User.get.prime
@@ -1,6 +1,12 @@
 import multiget_cache
+from cartographer.resources import get_resource_registry_container
+from cartographer.serializers.fragment_cache import LRUFragmentCache
 from multiget_cache.base_cache_wrapper import cached as library_cached
 from multiget_cache.multiget_cache_wrapper import multiget_cached as library_multiget_cached
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+fragment_cache = LRUFragmentCache(max_entries=10000, ttl_seconds=60)
 
 
 def get_request_cache():
@@ -20,3 +26,25 @@ def multiget_cached(object_key, argument_key=None, default_result=None,
     # we coerce args to strings so that SQL uses indexes even with mixed-type multiget args lists
     return library_multiget_cached(object_key, argument_key, default_result,
                                    result_fields, join_table_name, coerce_args_to_strings=True)
+
+
+def invalidate_fragments(model_class, resource_id=None):
+    """Drops the cached serializations of a written model, or of every model of its class if `resource_id` is None"""
+    for type_string in get_resource_registry_container().types_for_model(model_class):
+        fragment_cache.invalidate(type_string, resource_id)
+
+
+def invalidate_fragments_when_transaction_ends(session, model_class, resource_id=None):
+    """
+    Queues `invalidate_fragments` for when the session's transaction commits or rolls back.
+    Invalidating any earlier would let a request which reads the old row before the commit cache it again,
+    and rolled back rows may have been cached by reads made in their own transaction.
+    """
+    session.info.setdefault('written_models', set()).add((model_class, resource_id))
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def invalidate_written_fragments(session, transaction):
+    if transaction.parent is None:
+        for model_class, resource_id in session.info.pop('written_models', ()):
+            invalidate_fragments(model_class, resource_id)
@@ -0,0 +1,11 @@
+from flask import Response, stream_with_context
+
+
+def streamed_json_response(chunks):
+    """Streams the encoded chunks of e.g. `JSONAPISerializer.iter_json_api_document` to the client"""
+    return Response(stream_with_context(chunks), mimetype='application/json')
+
+
+def json_bytes_response(body):
+    """Sends an already encoded body, e.g. from `JSONAPISerializer.as_json_api_bytes`, without re-encoding it"""
+    return Response(body, mimetype='application/json')
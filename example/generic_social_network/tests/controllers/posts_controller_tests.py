@@ -98,6 +98,79 @@ class PostsControllerTestCase(ControllerTestCase):
         self.check_response(create_response, 400,
                             {'error': 'Provided post object was missing the body field'})
 
+    def test_create_many_posts(self):
+        self.make_an_author()
+        posts_json = [self.default_post_json(post_id=post_id)['data'] for post_id in [1, 2, 3]]
+        create_response = self.app.post('/posts', data=json.dumps({'data': posts_json}),
+                                        content_type='application/json')
+        expected_response = {
+            'data': posts_json,
+            'included': [self.default_author_json()['data']]
+        }
+        self.check_jsonapi_response(create_response, 201, expected_response)
+
+        get_response = self.app.get('/posts/2')
+        expected_response = self.default_post_json(post_id=2)
+        expected_response.update({'included': [self.default_author_json()['data']]})
+        self.check_jsonapi_response(get_response, 200, expected_response)
+
+    def test_create_posts_without_a_data_object(self):
+        for body in ['[{"data": []}]', '"data"', '{}', '{"meta": {}}']:
+            create_response = self.app.post('/posts', data=body, content_type='application/json')
+            self.check_response(create_response, 400, {'error': "Parameter 'data' is missing."})
+
+        create_response = self.app.post('/posts', data='{"data": [', content_type='application/json')
+        self.check_response(create_response, 400, None)
+
+    def test_create_many_invalid_posts(self):
+        self.make_an_author()
+        posts_json = [self.default_post_json(post_id=post_id)['data'] for post_id in [1, 2, 3]]
+        del posts_json[0]['attributes']['body']
+        del posts_json[2]['attributes']['body']
+        create_response = self.app.post('/posts', data=json.dumps({'data': posts_json}),
+                                        content_type='application/json')
+        self.check_response(create_response, 400,
+                            {'error': 'data[0]: Provided post object was missing the body field; '
+                                      'data[2]: Provided post object was missing the body field'})
+
+        get_response = self.app.get('/posts/2')
+        self.check_response(get_response, 404, None)
+
+    def test_import_posts(self):
+        self.make_an_author()
+        posts_json = [self.default_post_json(post_id=post_id)['data'] for post_id in [1, 2, 3]]
+        import_response = self.app.post('/posts/import', data=json.dumps({'data': posts_json}),
+                                        content_type='application/json')
+        self.check_response(import_response, 201, {'meta': {'imported': 3}})
+
+        get_response = self.app.get('/posts/3')
+        expected_response = self.default_post_json(post_id=3)
+        expected_response.update({'included': [self.default_author_json()['data']]})
+        self.check_jsonapi_response(get_response, 200, expected_response)
+
+    def test_import_invalid_posts(self):
+        self.make_an_author()
+        posts_json = [self.default_post_json(post_id=post_id)['data'] for post_id in [1, 2, 3]]
+        del posts_json[1]['attributes']['body']
+        import_response = self.app.post('/posts/import', data=json.dumps({'data': posts_json}),
+                                        content_type='application/json')
+        self.check_response(import_response, 400,
+                            {'error': 'data[1]: Provided post object was missing the body field'})
+
+        get_response = self.app.get('/posts/1')
+        self.check_response(get_response, 404, None)
+
+    def test_import_posts_with_a_non_integer_id(self):
+        self.make_an_author()
+        posts_json = [self.default_post_json(post_id=post_id)['data'] for post_id in [1, 2, 3]]
+        posts_json[2]['id'] = 'three'
+        import_response = self.app.post('/posts/import', data=json.dumps({'data': posts_json}),
+                                        content_type='application/json')
+        self.check_response(import_response, 400, {'error': 'Provided post id three was not an integer'})
+
+        get_response = self.app.get('/posts/1')
+        self.check_response(get_response, 404, None)
+
     def test_create_best_effort_post_id(self):
         post_id = 1
         post_data_no_id = self.default_post_json(post_id=post_id)
@@ -164,6 +237,44 @@ class PostsControllerTestCase(ControllerTestCase):
         get_response = self.app.get('/posts/{0}'.format(post_id))
         self.check_jsonapi_response(get_response, 200, expected_response)
 
+    def cached_post_fragments(self, post_id):
+        from generic_social_network.app.services.caching import fragment_cache
+        fragment_keys = fragment_cache.fragment_keys_by_resource.get(('post', str(post_id)), ())
+        return {fragment_key: fragment_cache.get(fragment_key) for fragment_key in fragment_keys}
+
+    def write_post_and_recache_it(self, post_id, end_transaction):
+        from generic_social_network.app import my_app
+        from generic_social_network.app.models.tables.post import Post
+        from generic_social_network.app.services.caching import fragment_cache
+
+        self.app.get('/posts/{0}'.format(post_id))
+        old_fragments = self.cached_post_fragments(post_id)
+        self.assertTrue(old_fragments)
+        with my_app.app_context():
+            Post.insert_on_duplicate_key_update({'post_id': post_id, 'author_id': 1, 'title': 'Changed'})
+            # a request reading the old row before the write ends caches it again
+            for fragment_key, fragment in old_fragments.items():
+                fragment_cache.set(fragment_key, fragment)
+            end_transaction(self.db.session)
+
+    def test_fragments_read_before_a_commit_are_dropped_by_it(self):
+        self.make_an_author_and_post()
+        self.write_post_and_recache_it(1, lambda session: session.commit())
+        self.assertEqual({}, self.cached_post_fragments(1))
+
+        get_response = self.app.get('/posts/1')
+        self.assertEqual('Changed', json.loads(get_response.data.decode('utf-8'))['data']['attributes']['title'])
+
+    def test_fragments_read_before_a_rollback_are_dropped_by_it(self):
+        self.make_an_author_and_post()
+        self.write_post_and_recache_it(1, lambda session: session.rollback())
+        self.assertEqual({}, self.cached_post_fragments(1))
+
+        get_response = self.app.get('/posts/1')
+        expected_response = self.default_post_json()
+        expected_response.update({'included': [self.default_author_json()['data']]})
+        self.check_jsonapi_response(get_response, 200, expected_response)
+
     def test_update_invalid_user(self):
         author_id = 1
         post_id = 1
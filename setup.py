@@ -1,13 +1,13 @@
 from setuptools import setup, find_packages
 
 setup(name='cartographer',
-      version='0.2.0-alpha5',
+      version='0.2.0-alpha6',
       description='Python library for using JSON API, especially with Flask.',
       url='http://github.com/Patreon/cartographer',
       author='Patreon',
       author_email='david@patreon.com',
       license='Apache 2.0',
-      packages=find_packages(exclude=['example', 'example.*', 'test', 'test.*']),
+      packages=find_packages(exclude=['example', 'example.*', 'test', 'test.*', 'benchmarks', 'benchmarks.*']),
       install_requires=[
           'python-dateutil>=2.4.2',
           'ciso8601>=1.0.1'
@@ -0,0 +1,38 @@
+from cartographer.exceptions.request_exceptions import DataMissing
+from cartographer.parsers.jsonapi_parser import PostedDocument
+from nose.tools import *
+
+
+def compound_document(comment_count):
+    return {
+        "data": {
+            "type": "post",
+            "id": "1",
+            "relationships": {
+                "comments": {
+                    "data": [{"type": "comment", "id": str(comment_id)} for comment_id in range(comment_count)]
+                }
+            }
+        },
+        "included": [
+            {"type": "comment", "id": str(comment_id), "attributes": {"body": "Comment {}".format(comment_id)}}
+            for comment_id in range(comment_count)
+        ] + [
+            {"type": "comment", "id": "0", "attributes": {"body": "A duplicate"}},
+        ]
+    }
+
+
+def test_related_resources_are_found_by_type_and_id():
+    document = PostedDocument(compound_document(3))
+    comments = document.data().related_resource("comments")
+
+    assert_equal(["Comment 0", "Comment 1", "Comment 2"], [comment.attribute("body") for comment in comments])
+    assert_equal("post", document.find_resource_by_type_and_id("post", "1").resource_type())
+    assert_is_none(document.find_resource_by_type_and_id("comment", "3"))
+    assert_is_none(document.find_resource_by_type_and_id("comment", ["0"]))
+
+
+def test_documents_without_a_data_member_are_missing_data():
+    for json_data in [{'meta': {}}, [{'data': {}}], 'data', None]:
+        assert_raises(DataMissing, PostedDocument(json_data).data)
@@ -0,0 +1,22 @@
+import json
+
+from cartographer.parsers.lazy_jsonapi_parser import LazyPostedDocument
+from cartographer.utils.lazy_json import lazy_json_loads
+from nose.tools import *
+
+from test.parsers.test_jsonapi_parser import compound_document
+from test.parsers.test_schema_parser import CustomGadgetParser, GadgetParser, gadget_document
+
+
+def test_lazy_documents_find_related_resources():
+    document = LazyPostedDocument(json.dumps(compound_document(3)).encode('utf-8'))
+    comments = document.data().related_resource("comments")
+
+    assert_equal(["Comment 0", "Comment 1", "Comment 2"], [comment.attribute("body") for comment in comments])
+    assert_is_none(document.find_resource_by_type_and_id("comment", "3"))
+
+
+def test_lazy_documents_parse_to_the_same_table_data():
+    for parser_class in [GadgetParser, CustomGadgetParser]:
+        lazy_json_data = lazy_json_loads(json.dumps(gadget_document()))
+        assert_equal(parser_class(gadget_document()).table_data(), parser_class(lazy_json_data).table_data())
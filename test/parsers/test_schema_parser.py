@@ -0,0 +1,124 @@
+from cartographer.exceptions.request_exceptions import BulkDataInvalid
+from cartographer.field_types import StringAttribute, IntAttribute, SchemaRelationship, ArrayRelationship
+from cartographer.parsers.schema_parser import SchemaParser
+from cartographer.schemas.schema import Schema
+from nose.tools import *
+
+
+class GadgetSchema(Schema):
+    SCHEMA = {
+        'type': 'gadget',
+        'id': StringAttribute().read_from(model_property='gadget_id').self_explanatory(),
+        'attributes': {
+            'name': StringAttribute().read_from(model_property='gadget_name').self_explanatory(),
+            'price': IntAttribute().read_from(model_property='price').self_explanatory(),
+            'popularity': IntAttribute().read_from(model_property='popularity').self_explanatory().computed(),
+        },
+        'relationships': {
+            'maker': SchemaRelationship(model_type='maker', id_attribute='maker_id'),
+            'parts': ArrayRelationship(model_type='part'),
+        }
+    }
+
+
+class GadgetParser(SchemaParser):
+    @classmethod
+    def schema(cls):
+        return GadgetSchema
+
+
+class CustomGadgetParser(GadgetParser):
+    def should_parse_attribute(self, key):
+        return key != 'price' and super().should_parse_attribute(key)
+
+    def validate(self, inbound_data):
+        if not inbound_data.attribute('name'):
+            raise ValueError("Provided gadget was missing its name")
+
+
+def gadget_document():
+    return {
+        'data': {
+            'type': 'gadget',
+            'attributes': {'name': 'Sprocket', 'price': 250, 'popularity': 9, 'unknown': True},
+            'relationships': {
+                'maker': {'data': {'type': 'maker', 'id': '3'}},
+                'parts': {'data': [{'type': 'part', 'id': '1'}, {'type': 'part', 'id': '2'}]},
+            }
+        }
+    }
+
+
+def test_table_data():
+    expected_table_data = {
+        'gadget_name': 'Sprocket',
+        'price': 250,
+        'maker_id': '3',
+        'parts': [{'id': '1'}, {'id': '2'}],
+    }
+    assert_equal(expected_table_data, GadgetParser(gadget_document()).table_data())
+
+
+def test_parsers_which_customize_parsing_skip_the_plan():
+    assert_true(GadgetParser.uses_default_parsing())
+    assert_false(CustomGadgetParser.uses_default_parsing())
+    assert_not_in('price', CustomGadgetParser(gadget_document()).table_data())
+
+
+def test_parse_plan_is_built_once_per_class():
+    assert_is(GadgetParser.parse_plan(), GadgetParser.parse_plan())
+    assert_is_not(GadgetParser.parse_plan(), CustomGadgetParser.parse_plan())
+    assert_equal({'name', 'price'}, set(GadgetParser.parse_plan().attributes))
+
+
+def test_null_and_missing_relationship_data_parse_the_same_either_way():
+    document = gadget_document()
+    document['data']['attributes'] = {'name': 'Sprocket'}
+    document['data']['relationships'] = {
+        'maker': {'data': None},
+        'parts': {'links': {'related': '/gadgets/1/parts'}},
+    }
+    for parser_class in [GadgetParser, CustomGadgetParser]:
+        assert_equal({'gadget_name': 'Sprocket', 'maker_id': None}, parser_class(document).table_data())
+
+    document['data']['relationships'] = {'maker': {'links': {}}, 'parts': {'data': None}}
+    for parser_class in [GadgetParser, CustomGadgetParser]:
+        assert_equal({'gadget_name': 'Sprocket', 'parts': []}, parser_class(document).table_data())
+
+
+def bulk_gadget_document(names):
+    return {
+        'data': [
+            {'type': 'gadget', 'attributes': {'name': name, 'price': index}}
+            for index, name in enumerate(names)
+        ]
+    }
+
+
+def test_table_data_many():
+    for parser_class in [GadgetParser, CustomGadgetParser]:
+        rows = parser_class(bulk_gadget_document(['Sprocket', 'Gear'])).validated_table_data_many()
+        assert_equal(['Sprocket', 'Gear'], [row['gadget_name'] for row in rows])
+    assert_equal([{'gadget_name': 'Sprocket', 'price': 250, 'maker_id': '3', 'parts': [{'id': '1'}, {'id': '2'}]}],
+                 GadgetParser(gadget_document()).table_data_many())
+
+
+def test_bulk_validation_errors_are_collected_per_row():
+    parser = CustomGadgetParser(bulk_gadget_document(['Sprocket', '', 'Gear', None]))
+    with assert_raises(BulkDataInvalid) as context:
+        parser.validated_table_data_many()
+
+    assert_equal([1, 3], sorted(context.exception.row_errors))
+    assert_equal(400, context.exception.status_code)
+    assert_equal('data[1]: Provided gadget was missing its name; data[3]: Provided gadget was missing its name',
+                 context.exception.error_description)
+
+
+class BrokenGadgetParser(GadgetParser):
+    def validate(self, inbound_data):
+        raise KeyError('maker')
+
+
+def test_unexpected_errors_are_not_collected_as_bulk_errors():
+    with assert_raises(KeyError):
+        BrokenGadgetParser(bulk_gadget_document(['Sprocket', 'Gear'])).validated_table_data_many()
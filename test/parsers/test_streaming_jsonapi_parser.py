@@ -0,0 +1,51 @@
+import io
+import json
+
+from cartographer.exceptions.request_exceptions import BulkDataInvalid, DataMissing
+from cartographer.parsers.streaming_jsonapi_parser import StreamingPostedDocument
+from nose.tools import *
+
+from test.parsers.test_schema_parser import CustomGadgetParser, GadgetParser
+
+
+def streamed(json_data, chunk_size=16):
+    return StreamingPostedDocument(io.BytesIO(json.dumps(json_data).encode('utf-8')), chunk_size=chunk_size)
+
+
+def test_resources_are_yielded_as_they_arrive():
+    document = streamed({
+        'included': [{'type': 'maker', 'id': '3', 'attributes': {'name': 'Acme'}}],
+        'data': [
+            {'type': 'gadget', 'id': str(gadget_id),
+             'relationships': {'maker': {'data': {'type': 'maker', 'id': '3'}}}}
+            for gadget_id in range(3)
+        ],
+        'meta': {'source': 'import'},
+    })
+    resources = document.iter_data()
+    first_gadget = next(resources)
+
+    assert_equal('Acme', first_gadget.related_resource('maker').attribute('name'))
+    assert_equal({}, document.json_data)
+    assert_equal(2, len(list(resources)))
+    assert_equal({'meta': {'source': 'import'}}, document.json_data)
+    assert_raises(ValueError, list, document.iter_data())
+
+
+def test_data_reads_single_resources():
+    assert_equal('gadget', streamed({'data': {'type': 'gadget', 'id': '1'}}).data().resource_type())
+    assert_raises(DataMissing, streamed({'meta': {}}).data)
+
+
+def test_streamed_bulk_parsing():
+    posted_gadgets = [{'type': 'gadget', 'attributes': {'name': name, 'price': 5}} for name in ['Sprocket', '', 'Gear']]
+    for parser_class in [GadgetParser, CustomGadgetParser]:
+        document = streamed({'data': posted_gadgets})
+        rows = parser_class(json_data=document.json_data).iter_validated_table_data_many(document.iter_data())
+        assert_equal('Sprocket', next(rows)[1]['gadget_name'])
+        if parser_class is CustomGadgetParser:
+            with assert_raises(BulkDataInvalid) as context:
+                list(rows)
+            assert_equal([1], list(context.exception.row_errors))
+        else:
+            assert_equal(['', 'Gear'], [table_data['gadget_name'] for _, table_data in rows])
@@ -0,0 +1,5 @@
+from threading import Event
+
+# lets tests hold `slowly_registered_resource` mid-import
+started = Event()
+release = Event()
@@ -0,0 +1,4 @@
+from cartographer.resources import get_resource_registry_container
+
+get_resource_registry_container().register_resource(type_string='lazy-widget', schema=dict)
+get_resource_registry_container().register_resource(type_string='lazy-gadget', schema=list)
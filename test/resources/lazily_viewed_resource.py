@@ -0,0 +1,3 @@
+from cartographer.resources import get_resource_registry_container
+
+get_resource_registry_container().register_resource(type_string='lazy-viewed', schema=dict)
@@ -0,0 +1,6 @@
+from cartographer.resources import get_resource_registry_container
+from test.resources import import_gate
+
+import_gate.started.set()
+import_gate.release.wait(5)
+get_resource_registry_container().register_resource(type_string='slow-widget', schema=dict)
@@ -0,0 +1,142 @@
+import sys
+import time
+from importlib import import_module
+from threading import Barrier, Thread
+
+from cartographer.permissions.base_mask import BaseMask
+from cartographer.resources import get_resource_entry, get_resource_registry, get_resource_registry_container
+from cartographer.resources.resource_registry import EMPTY_ENTRY, ResourceRegistry, ResourceRegistryKeys
+from nose.tools import *
+
+from test.resources import import_gate
+
+
+def test_entries_are_records_of_the_registered_values():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=dict, mask=BaseMask)
+
+    entry = registry.entry('widget')
+    assert_equal('widget', entry.type)
+    assert_is(dict, entry.schema)
+    assert_is_none(entry.serializer)
+    assert_is(BaseMask, entry.get(ResourceRegistryKeys.MASK))
+    assert_equal('fallback', entry.get(ResourceRegistryKeys.MODEL, 'fallback'))
+    assert_is(EMPTY_ENTRY, registry.entry('unregistered'))
+
+
+def test_freeze_snapshots_until_the_next_registration():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=dict)
+    frozen = registry.freeze()
+
+    assert_is(frozen['widget'], registry.entry('widget'))
+    with assert_raises(TypeError):
+        frozen['gadget'] = EMPTY_ENTRY
+    with assert_raises(AttributeError):
+        registry.entry('widget').schema = list
+
+    registry.register_resource(type_string='widget', schema=list)
+    assert_is_none(registry.frozen)
+    assert_is(list, registry.entry('widget').schema)
+
+
+def test_initialization_hook_is_called_once_across_threads():
+    calls = []
+    registry = ResourceRegistry()
+    registry.set_initialization_hook(lambda: calls.append(None))
+    barrier = Barrier(8)
+
+    def look_up():
+        barrier.wait()
+        registry.call_initialization_hook()
+
+    threads = [Thread(target=look_up) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert_equal(1, len(calls))
+
+
+def test_lazy_registrations_are_imported_on_first_lookup():
+    import_path = 'test.resources.lazily_registered_resource'
+    registry = get_resource_registry_container()
+    registry.register_lazy('lazy-widget', import_path)
+    registry.register_lazy('lazy-gadget', import_path)
+    assert_not_in(import_path, sys.modules)
+
+    assert_is(dict, get_resource_entry('lazy-widget').schema)
+    assert_in(import_path, sys.modules)
+    assert_is(list, get_resource_entry('lazy-gadget').schema)
+    assert_not_in('lazy-gadget', registry.lazy_registrations)
+
+    timing, = [timing for timing in registry.import_report() if timing.import_path == import_path]
+    assert_equal(('lazy-gadget', 'lazy-widget'), timing.type_strings)
+    assert_greater_equal(timing.seconds, 0)
+
+
+def test_entries_are_cached_until_the_registry_changes():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=dict, mask=BaseMask)
+    assert_is(registry.entry('widget'), registry.entry('widget'))
+
+    registry.unregister('widget', ResourceRegistryKeys.MASK)
+    assert_is_none(registry.entry('widget').mask)
+    registry.unregister('widget')
+    assert_is(EMPTY_ENTRY, registry.entry('widget'))
+
+
+def test_the_registry_view_is_read_only():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=dict)
+    view = registry.view()
+
+    assert_is(dict, view['widget'][ResourceRegistryKeys.SCHEMA])
+    with assert_raises(TypeError):
+        view['gadget'] = {}
+    with assert_raises(TypeError):
+        view['widget'][ResourceRegistryKeys.SCHEMA] = list
+
+
+def test_the_registry_view_imports_lazy_registrations_only_when_read():
+    import_path = 'test.resources.lazily_viewed_resource'
+    get_resource_registry_container().register_lazy('lazy-viewed', import_path)
+    view = get_resource_registry()
+
+    assert_in('lazy-viewed', view)
+    assert_in('lazy-viewed', list(view))
+    assert_not_in(import_path, sys.modules)
+    assert_is(dict, view['lazy-viewed'][ResourceRegistryKeys.SCHEMA])
+    assert_in(import_path, sys.modules)
+
+
+def test_types_for_model_follow_registrations():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=dict, model=int)
+    registry.register_resource(type_string='gizmo', schema=dict, model=int)
+    registry.register_lazy('gadget', 'test.resources.never_imported_resource')
+    assert_equal(('widget', 'gizmo'), registry.types_for_model(int))
+
+    registry.unregister('gizmo')
+    assert_equal(('widget',), registry.types_for_model(int))
+    assert_equal((), registry.types_for_model(str))
+
+
+def test_lazy_imports_do_not_deadlock_with_direct_imports():
+    import_path = 'test.resources.slowly_registered_resource'
+    registry = get_resource_registry_container()
+    registry.register_lazy('slow-widget', import_path)
+
+    direct_import = Thread(target=import_module, args=(import_path,), daemon=True)
+    direct_import.start()
+    import_gate.started.wait(5)
+    entries = []
+    lazy_import = Thread(target=lambda: entries.append(registry.entry('slow-widget')), daemon=True)
+    lazy_import.start()
+    time.sleep(0.05)  # lets the lookup reach the import, which waits on the direct one
+    import_gate.release.set()
+
+    direct_import.join(5)
+    lazy_import.join(5)
+    assert_false(direct_import.is_alive() or lazy_import.is_alive())
+    assert_is(dict, entries[0].schema)
@@ -0,0 +1,65 @@
+from cartographer.field_types import StringAttribute, SchemaRelationship
+from cartographer.parsers.schema_parser import SchemaParser
+from cartographer.resources.resource_registry import ResourceRegistry
+from cartographer.schemas.schema import Schema
+from nose.tools import *
+
+
+class WidgetSchema(Schema):
+    SCHEMA = {
+        'type': 'widget',
+        'id': StringAttribute().read_from(model_property='widget_id').self_explanatory(),
+        'attributes': {
+            'name': StringAttribute().read_from(model_property='name').description('The name of the widget'),
+        },
+        'relationships': {
+            'maker': SchemaRelationship(model_type='maker', id_attribute='maker_id'),
+        }
+    }
+
+
+class UndescribedWidgetSchema(Schema):
+    SCHEMA = dict(WidgetSchema.SCHEMA, attributes={
+        'name': StringAttribute().read_from(model_property='name'),
+    })
+
+
+class WidgetParser(SchemaParser):
+    @classmethod
+    def schema(cls):
+        return WidgetSchema
+
+
+class Widget(object):
+    widget_id = 4
+    name = 'Whatsit'
+
+
+def test_compiled_schema_matches_the_raw_schema():
+    assert_is_none(WidgetSchema.compiled_schema())
+    raw = (WidgetSchema.attributes(), WidgetSchema.relationships(), WidgetSchema.attribute('name'))
+
+    compiled = WidgetSchema.compile()
+    assert_is(compiled, WidgetSchema.compile())
+    assert_equal(raw, (WidgetSchema.attributes(), WidgetSchema.relationships(), WidgetSchema.attribute('name')))
+    assert_equal('widget', WidgetSchema.resource_type())
+    assert_equal(('maker',), compiled.relationship_keys)
+    assert_equal('Whatsit', compiled.attribute_accessors['name'](type('Serializer', (), {'model': Widget})))
+    with assert_raises(TypeError):
+        compiled.attributes['other'] = None
+
+
+def test_compile_verifies_the_schema():
+    with assert_raises_regex(ValueError, r'UndescribedWidgetSchema\.name: Description string'):
+        UndescribedWidgetSchema.compile()
+    assert_is_none(UndescribedWidgetSchema.compiled_schema())
+
+
+def test_registry_compile_builds_plans_and_freezes():
+    registry = ResourceRegistry()
+    registry.register_resource(type_string='widget', schema=WidgetSchema, parser=WidgetParser)
+
+    frozen = registry.compile()
+    assert_is(frozen, registry.frozen)
+    assert_is_not_none(WidgetSchema.compiled_schema())
+    assert_in('_parse_plan', WidgetParser.__dict__)
@@ -0,0 +1,84 @@
+from threading import Thread
+
+from cartographer.serializers.fragment_cache import LRUFragmentCache
+from cartographer.utils.version import JSONAPIVersion
+from nose.tools import *
+
+from test.test_schema_serializer import Widget, WidgetSerializer
+
+
+class CachedWidgetSerializer(WidgetSerializer):
+    fragment_cache = LRUFragmentCache(max_entries=10)
+
+
+def test_fragments_are_reused_until_invalidated():
+    CachedWidgetSerializer.fragment_cache.invalidate('widget')
+    widget = Widget(1, 'sprocket', 250)
+    first_json = CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)
+
+    widget.name = 'gear'
+    assert_equal(first_json, CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0))
+    assert_equal('sprocket', first_json['attributes']['name'])
+
+    CachedWidgetSerializer.fragment_cache.invalidate('widget', '1')
+    assert_equal('gear', CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)
+                 ['attributes']['name'])
+
+
+def test_fragments_are_keyed_by_version_and_fields():
+    CachedWidgetSerializer.fragment_cache.invalidate('widget')
+    widget = Widget(2, 'sprocket', 250)
+    full_json = CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)
+    sparse_json = CachedWidgetSerializer(widget, requested_fields={'widget': ['price']}) \
+        .as_json_api_data(JSONAPIVersion.JSONAPI_1_0)
+    rc3_json = CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_RC3)
+
+    assert_equal({'price': 250}, sparse_json['attributes'])
+    assert_in('name', full_json['attributes'])
+    assert_not_in('attributes', rc3_json)
+    assert_equal(3, len(CachedWidgetSerializer.fragment_cache.fragment_keys_by_resource[('widget', '2')]))
+
+
+def test_encoded_fragments_are_spliced_into_documents():
+    CachedWidgetSerializer.fragment_cache.invalidate('widget')
+    widget = Widget(3, 'sprocket', 250)
+    first_bytes = CachedWidgetSerializer(widget).as_json_api_bytes(JSONAPIVersion.JSONAPI_1_0)
+
+    widget.name = 'gear'
+    assert_equal(first_bytes, CachedWidgetSerializer(widget).as_json_api_bytes(JSONAPIVersion.JSONAPI_1_0))
+
+    CachedWidgetSerializer.fragment_cache.invalidate('widget', '3')
+    assert_in(b'"gear"', CachedWidgetSerializer(widget).as_json_api_bytes(JSONAPIVersion.JSONAPI_1_0))
+
+
+def test_modifying_a_document_does_not_change_the_cache():
+    CachedWidgetSerializer.fragment_cache.invalidate('widget')
+    widget = Widget(4, 'sprocket', 250)
+    CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)['attributes']['name'] = 'changed'
+    cached_json = CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)
+    cached_json['attributes']['name'] = 'changed again'
+
+    assert_equal('sprocket',
+                 CachedWidgetSerializer(widget).as_json_api_data(JSONAPIVersion.JSONAPI_1_0)['attributes']['name'])
+
+
+def test_concurrent_sets_and_invalidations_keep_the_index_consistent():
+    fragment_cache = LRUFragmentCache(max_entries=50)
+
+    def set_fragments(offset):
+        for index in range(500):
+            fragment_cache.set(('widget', str(index % 7), offset, index), {'id': str(index)})
+
+    def invalidate_fragments():
+        for _ in range(500):
+            fragment_cache.invalidate('widget')
+
+    threads = [Thread(target=set_fragments, args=(offset,)) for offset in range(4)]
+    threads.append(Thread(target=invalidate_fragments))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    indexed_keys = set().union(*fragment_cache.fragment_keys_by_resource.values())
+    assert_equal(set(fragment_cache.fragments._entries), indexed_keys)
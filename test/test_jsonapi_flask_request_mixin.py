@@ -1,4 +1,6 @@
 from cartographer.requests.jsonapi_flask_request_mixin import JSONAPIFlaskRequestMixin
+from cartographer.utils.lru_cache import LRUCache
+from cartographer.utils.version import JSONAPIVersion, get_default_version
 from nose.tools import *
 
 
@@ -16,3 +18,59 @@ def test_parse_parameters_to_dictionary():
     }
     assert_equals(JSONAPIFlaskRequestMixin._parse_parameters_to_dictionary(params).get('fields'),
                   expected_result)
+
+
+class ArgsRequest(JSONAPIFlaskRequestMixin):
+    def __init__(self, args):
+        self.args = args
+
+
+def test_query_parameters_are_parsed_once():
+    request = ArgsRequest({
+        'include': 'author,comments.author',
+        'fields[post]': 'title,body',
+        'filter[author][id]': '3',
+        'page[count]': '20',
+        'json-api-version': '1.0RC3',
+    })
+    query_parameters = request.get_query_parameters()
+
+    assert_is(query_parameters, request.get_query_parameters())
+    assert_equal(('author', 'comments.author'), request.get_includes())
+    assert_is(query_parameters.include_tree, request.get_include_tree())
+    assert_equal({'post': ('body', 'title')}, request.get_requested_fields())
+    assert_equal('3', request.get_filters()['author']['id'])
+    assert_equal((None, None, 20), request.get_pagination())
+    assert_equal(JSONAPIVersion.JSONAPI_RC3, request.get_json_api_version())
+    with assert_raises(TypeError):
+        request.get_requested_fields()['user'] = ('name',)
+
+
+def test_empty_query_parameters():
+    request = ArgsRequest({'include': 'none'})
+    assert_equal((), request.get_includes())
+    assert_equal({}, request.get_requested_fields())
+    assert_equal(get_default_version(), request.get_json_api_version())
+    assert_is_none(ArgsRequest({}).get_includes())
+
+
+def test_equivalent_requests_share_a_plan():
+    class CachingRequest(ArgsRequest):
+        request_plan_cache = LRUCache(max_entries=8)
+
+    first = CachingRequest({'include': 'comments,author', 'fields[post]': 'title,body', 'page[count]': '5'})
+    second = CachingRequest({'fields[post]': 'body,title,body', 'include': 'author,comments,author', 'sort': 'id'})
+    assert_is(first.get_query_parameters().plan, second.get_query_parameters().plan)
+    assert_equal(('author', 'comments'), second.get_includes())
+    assert_equal((None, None, 5), first.get_pagination())
+    assert_equal((None, None, 10), second.get_pagination())
+
+    other = CachingRequest({'include': 'author', 'fields[post]': 'title,body'})
+    assert_is_not(first.get_query_parameters().plan, other.get_query_parameters().plan)
+    assert_equal(2, len(CachingRequest.request_plan_cache))
+
+
+def test_invalid_version_is_raised_from_a_cached_plan():
+    for _ in range(2):
+        with assert_raises(ValueError):
+            ArgsRequest({'json-api-version': 'not-a-version'}).get_json_api_version()
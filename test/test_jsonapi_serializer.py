@@ -1,5 +1,9 @@
+import json
+
 from cartographer.serializers import JSONAPISerializer, JSONAPINullSerializer, \
     JSONAPICollectionSerializer
+from cartographer.utils.json_encoding import stdlib_json_encoder
+from cartographer.utils.version import JSONAPIVersion
 from nose.tools import *
 
 
@@ -113,6 +117,59 @@ def test_linked_null():
     assert_equal(expected_json, resource.as_json_api_document())
 
 
+def test_rc3_linked_resources():
+    resource = LinkingResource(1, JSONAPICollectionSerializer([ExampleSerializer(2)]))
+    expected_json = {
+        "data": {
+            "type": "linking_example",
+            "id": "1",
+            "title": "an example of linking",
+            "links": {
+                "something": {
+                    "linkage": [{"type": "example", "id": "2"}]
+                }
+            }
+        },
+        "included": [
+            {
+                "type": "example",
+                "id": "2",
+                "title": "an example"
+            }
+        ]
+    }
+    assert_equal(expected_json, resource.as_json_api_document(JSONAPIVersion.JSONAPI_RC3))
+
+
+def test_rc2_linked_resources():
+    resource = LinkingResource(1, ExampleSerializer(2))
+    expected_json = {
+        "data": {
+            "type": "linking_example",
+            "id": "1",
+            "title": "an example of linking",
+            "links": {
+                "something": {
+                    "type": "example",
+                    "id": "2",
+                    "links": {
+                        "resource": "http://www.example.com/examples/2",
+                    },
+                }
+            }
+        },
+        "linked": [
+            {
+                "type": "example",
+                "id": "2",
+                "title": "an example"
+            }
+        ]
+    }
+    assert_equal(expected_json, resource.as_json_api_document(JSONAPIVersion.JSONAPI_RC2))
+    assert_equal({"id": None}, JSONAPINullSerializer().as_link_json(JSONAPIVersion.JSONAPI_RC2))
+
+
 def test_linked_collection():
     resource = LinkingResource(1, JSONAPICollectionSerializer([ExampleSerializer(2), ExampleSerializer(3)]))
     expected_json = {
@@ -299,3 +356,70 @@ def test_toplevel_collection_with_repeats():
         ]
     }
     assert_equal(expected_json, resource.as_json_api_document())
+
+
+def test_streamed_document_matches_document():
+    resources = [
+        ExampleSerializer(1),
+        LinkingResource(1, JSONAPINullSerializer()),
+        JSONAPICollectionSerializer([ExampleSerializer(2), LinkingResource(2, ExampleSerializer(3))]),
+        JSONAPICollectionSerializer([]),
+    ]
+    for resource in resources:
+        streamed_json = json.loads(b''.join(resource.iter_json_api_document()).decode('utf-8'))
+        assert_equal(resource.as_json_api_document(), streamed_json)
+
+
+def test_document_bytes_match_document_with_any_encoder():
+    resource = JSONAPICollectionSerializer([ExampleSerializer(2), LinkingResource(2, ExampleSerializer(3))])
+    for encoder in [None, stdlib_json_encoder]:
+        document_bytes = resource.as_json_api_bytes(encoder=encoder)
+        assert_equal(resource.as_json_api_document(), json.loads(document_bytes.decode('utf-8')))
+
+
+class CountingSerializer(JSONAPISerializer):
+    def __init__(self, id):
+        self._id = id
+        self.resource_id_calls = 0
+
+    def resource_type(self):
+        return "example"
+
+    def resource_id(self):
+        self.resource_id_calls += 1
+        return str(self._id)
+
+    def attributes_dictionary(self):
+        return {}
+
+
+def test_resource_ids_are_computed_once():
+    shared_resource = CountingSerializer(4)
+    resource = JSONAPICollectionSerializer([
+        LinkingResource(1, shared_resource),
+        LinkingResource(2, shared_resource),
+        LinkingResource(3, JSONAPICollectionSerializer([shared_resource])),
+    ])
+    resource.as_json_api_document()
+
+    assert_equal(1, shared_resource.resource_id_calls)
+    assert_equal(('example', '4'), shared_resource.resource_key())
+    assert_equal(shared_resource.as_linkage_json(), shared_resource.as_linkage_json())
+
+
+def test_linkage_is_not_shared_between_or_within_documents():
+    shared_resource = CountingSerializer(4)
+    resource = JSONAPICollectionSerializer([LinkingResource(1, shared_resource), LinkingResource(2, shared_resource)])
+    for version, links_key, linkage_key in [(JSONAPIVersion.JSONAPI_1_0, 'relationships', 'data'),
+                                            (JSONAPIVersion.JSONAPI_RC3, 'links', 'linkage')]:
+        first_linkage, second_linkage = [
+            resource_json[links_key]['something'][linkage_key]
+            for resource_json in resource.as_json_api_document(version)['data']
+        ]
+        assert_is_not(first_linkage, second_linkage)
+        first_linkage['id'] = '5'
+        assert_equal({'type': 'example', 'id': '4'}, second_linkage)
+        assert_equal({'type': 'example', 'id': '4'}, shared_resource.as_linkage_json())
+
+    shared_resource.as_json_api_relationship_document()['data']['id'] = '5'
+    assert_equal({'type': 'example', 'id': '4'}, shared_resource.as_linkage_json())
@@ -0,0 +1,442 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cartographer.field_types import StringAttribute, IntAttribute, SchemaAttribute, SchemaRelationship
+from cartographer.permissions.base_mask import BaseMask
+from cartographer.resources import get_resource_registry_container
+from cartographer.resources.resource_registry import ResourceRegistryKeys
+from cartographer.schemas.schema import Schema
+from cartographer.serializers import SchemaSerializer, JSONAPICollectionSerializer
+from cartographer.utils import config
+from cartographer.utils.include_tree import IncludeTree
+from nose.tools import *
+
+
+class Widget(object):
+    def __init__(self, widget_id, name, amount_cents):
+        self.widget_id = widget_id
+        self.name = name
+        self.amount_cents = amount_cents
+
+    def display_name(self):
+        return self.name.title()
+
+
+class ShoutingAttribute(SchemaAttribute):
+    def to_json(self, serializer):
+        return serializer.model.name.upper()
+
+
+class WidgetSchema(Schema):
+    SCHEMA = {
+        'type': 'widget',
+        'id': StringAttribute()
+                .read_from(model_property='widget_id')
+                .self_explanatory(),
+        'attributes': {
+            'name': StringAttribute()
+                .read_from(model_property='name')
+                .self_explanatory(),
+            'display-name': StringAttribute()
+                .read_from(model_method='display_name')
+                .self_explanatory(),
+            'price': IntAttribute()
+                .read_from(model_property='amount_cents')
+                .nullable()
+                .self_explanatory(),
+            'shout': ShoutingAttribute()
+                .read_from(model_property='name')
+                .self_explanatory(),
+            'tagline': StringAttribute()
+                .read_from(serializer_method='tagline')
+                .self_explanatory(),
+        }
+    }
+
+
+class WidgetSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return WidgetSchema
+
+    def tagline(self):
+        return 'the best ' + self.model.name
+
+
+class TerseWidgetSerializer(WidgetSerializer):
+    @classmethod
+    def default_fields(cls):
+        return ['name']
+
+
+def test_attributes_dictionary():
+    serializer = WidgetSerializer(Widget(1, 'sprocket', None))
+    expected_json = {
+        'name': 'sprocket',
+        'display-name': 'Sprocket',
+        'price': None,
+        'shout': 'SPROCKET',
+        'tagline': 'the best sprocket',
+    }
+    assert_equal(expected_json, serializer.attributes_dictionary())
+    assert_equal('1', serializer.resource_id_str())
+
+
+def test_attributes_dictionary_with_requested_fields():
+    serializer = WidgetSerializer(Widget(1, 'sprocket', 250), requested_fields={'widget': ['price']})
+    assert_equal({'price': 250}, serializer.attributes_dictionary())
+
+
+def test_serialization_plan_is_built_once_per_class():
+    assert_is(WidgetSerializer.serialization_plan(), WidgetSerializer.serialization_plan())
+    assert_is_not(WidgetSerializer.serialization_plan(), TerseWidgetSerializer.serialization_plan())
+    assert_equal(frozenset(['name']), TerseWidgetSerializer.serialization_plan().default_fields)
+    assert_equal({'name': 'gear'}, TerseWidgetSerializer(Widget(2, 'gear', 100)).attributes_dictionary())
+
+
+class Author(object):
+    def __init__(self, author_id):
+        self.author_id = author_id
+        self.name = 'Author {}'.format(author_id)
+
+
+class Book(object):
+    def __init__(self, book_id, author_id):
+        self.book_id = book_id
+        self.author_id = author_id
+        self.title = 'Book {}'.format(book_id)
+
+
+class AuthorSchema(Schema):
+    SCHEMA = {
+        'type': 'author',
+        'id': StringAttribute().read_from(model_property='author_id').self_explanatory(),
+        'attributes': {
+            'name': StringAttribute().read_from(model_property='name').self_explanatory(),
+        }
+    }
+
+
+class BookSchema(Schema):
+    SCHEMA = {
+        'type': 'book',
+        'id': StringAttribute().read_from(model_property='book_id').self_explanatory(),
+        'attributes': {
+            'title': StringAttribute().read_from(model_property='title').self_explanatory(),
+        },
+        'relationships': {
+            'author': SchemaRelationship(model_type='author', id_attribute='author_id'),
+        }
+    }
+
+
+class AuthorSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return AuthorSchema
+
+
+class BookSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return BookSchema
+
+
+class AuthorStore(object):
+    def __init__(self):
+        self.authors = {author_id: Author(author_id) for author_id in range(3)}
+        self.get_calls = []
+        self.get_threads = []
+        self.get_many_calls = []
+
+    def get(self, author_id):
+        self.get_calls.append(author_id)
+        self.get_threads.append(threading.current_thread())
+        return self.authors.get(author_id)
+
+    def get_many(self, author_ids):
+        self.get_many_calls.append(sorted(author_ids))
+        return {author_id: self.authors[author_id] for author_id in author_ids if author_id in self.authors}
+
+
+def register_authors_and_books(author_store, with_get_many=True):
+    registry = get_resource_registry_container()
+    registry.register_resource(
+        type_string='author',
+        schema=AuthorSchema,
+        serializer=AuthorSerializer,
+        model=Author,
+        model_get=author_store.get,
+        model_get_many=author_store.get_many if with_get_many else None,
+    )
+    registry.register_resource(type_string='book', schema=BookSchema, serializer=BookSerializer, model=Book)
+    if not with_get_many:
+        registry.unregister('author', ResourceRegistryKeys.MODEL_GET_MANY)
+
+
+def books_document(book_count=6, **serializer_kwargs):
+    books = [Book(book_id, book_id % 2) for book_id in range(book_count)]
+    return JSONAPICollectionSerializer([
+        BookSerializer(book, **serializer_kwargs)
+        for book in books
+    ]).as_json_api_document()
+
+
+def test_related_models_are_fetched_once_per_type_and_level():
+    author_store = AuthorStore()
+    register_authors_and_books(author_store)
+
+    document = books_document()
+
+    assert_equal([[0, 1]], author_store.get_many_calls)
+    assert_equal([], author_store.get_calls)
+    assert_equal({'author': {'data': {'type': 'author', 'id': '1'}}}, document['data'][1]['relationships'])
+    assert_equal([('author', '0'), ('author', '1')],
+                 [(resource['type'], resource['id']) for resource in document['included']])
+
+
+def test_related_models_fall_back_to_model_get():
+    author_store = AuthorStore()
+    register_authors_and_books(author_store, with_get_many=False)
+
+    document = books_document()
+
+    assert_equal([], author_store.get_many_calls)
+    assert_equal([0, 1], author_store.get_calls)
+    assert_equal(2, len(document['included']))
+
+
+def test_children_share_the_parent_include_tree():
+    register_authors_and_books(AuthorStore())
+    include_tree = IncludeTree.from_paths(['author.books'])
+    books = [BookSerializer(Book(book_id, 0), includes=include_tree) for book_id in range(2)]
+    authors = [book.linked_resources()['author'] for book in books]
+
+    assert_equal(['author.books'], books[0].includes)
+    assert_is(books[0].include_tree.subtree('author'), authors[0].include_tree)
+    assert_is(authors[0].include_tree, authors[1].include_tree)
+
+
+def test_children_fall_back_to_default_includes():
+    register_authors_and_books(AuthorStore())
+    book = BookSerializer(Book(1, 0), includes=['author'])
+
+    assert_equal(['author'], book.normalized_includes())
+    assert_is(AuthorSerializer.serialization_plan().default_include_tree,
+              book.linked_resources()['author'].include_tree)
+
+
+def test_related_serializers_are_shared_within_a_document():
+    register_authors_and_books(AuthorStore())
+    include_tree = IncludeTree.from_paths(['author'])
+    books = [BookSerializer(Book(book_id, book_id % 2), includes=include_tree) for book_id in range(6)]
+    JSONAPICollectionSerializer(books).as_json_api_document()
+
+    authors = [book.linked_resources()['author'] for book in books]
+    assert_is(authors[0], authors[2])
+    assert_is(authors[1], authors[5])
+    assert_is_not(authors[0], authors[1])
+    assert_equal(2, len(set(id(author) for author in authors)))
+
+
+def test_related_serializers_are_not_shared_across_documents():
+    register_authors_and_books(AuthorStore())
+    first_book = BookSerializer(Book(1, 0), includes=['author'])
+    second_book = BookSerializer(Book(2, 0), includes=['author'])
+    first_book.as_json_api_document()
+    second_book.as_json_api_document()
+
+    assert_is_not(first_book.document, second_book.document)
+    assert_is_not(first_book.linked_resources()['author'], second_book.linked_resources()['author'])
+
+
+class CountingAuthorMask(BaseMask):
+    calls = []
+
+    @classmethod
+    def fields_cant_view_many(cls, models, user_id):
+        cls.calls.append(('fields', sorted(author.author_id for author in models), user_id))
+        return [['name'] if author.author_id == 1 else [] for author in models]
+
+    @classmethod
+    def includes_cant_view_many(cls, models, user_id):
+        cls.calls.append(('includes', sorted(author.author_id for author in models), user_id))
+        return [[] for _ in models]
+
+
+def test_masks_are_evaluated_once_per_type_and_level():
+    register_authors_and_books(AuthorStore())
+    get_resource_registry_container().register_resource(type_string='author', schema=AuthorSchema,
+                                                        mask=CountingAuthorMask)
+    CountingAuthorMask.calls = []
+    try:
+        document = books_document(includes=['author'], current_user_id=7)
+    finally:
+        get_resource_registry_container().unregister('author', ResourceRegistryKeys.MASK)
+
+    assert_equal([('fields', [0, 1], 7)], CountingAuthorMask.calls)
+    assert_equal([{'name': 'Author 0'}, {}], [resource['attributes'] for resource in document['included']])
+
+
+def test_sparse_fieldsets_apply_to_relationships():
+    author_store = AuthorStore()
+    register_authors_and_books(author_store)
+
+    document = books_document(includes=['author'], requested_fields={'book': ['title']})
+    assert_equal([], author_store.get_many_calls)
+    assert_not_in('included', document)
+    assert_not_in('relationships', document['data'][0])
+
+    document = books_document(includes=['author'], requested_fields={'book': ['title', 'author']})
+    assert_equal([[0, 1]], author_store.get_many_calls)
+    assert_equal(2, len(document['included']))
+
+
+def test_only_included_relationships_are_primed_once_per_id():
+    author_store = AuthorStore()
+    primed = []
+    register_authors_and_books(author_store, with_get_many=False)
+    get_resource_registry_container().register_resource(type_string='author', schema=AuthorSchema,
+                                                        model_prime=primed.append)
+    try:
+        books_document(includes=[])
+        assert_equal([], primed)
+        books_document(includes=['author'])
+        assert_equal([0, 1], primed)
+    finally:
+        get_resource_registry_container().unregister('author', ResourceRegistryKeys.MODEL_PRIME)
+
+
+class AsyncAuthorStore(AuthorStore):
+    def __init__(self):
+        super().__init__()
+        self.primed = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    async def prime_async(self, author_id):
+        self.primed.append(author_id)
+
+    async def get_async(self, author_id):
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return self.authors.get(author_id)
+
+
+def test_async_documents_await_each_level_together():
+    author_store = AsyncAuthorStore()
+    register_authors_and_books(author_store, with_get_many=False)
+    get_resource_registry_container().register_resource(type_string='author', schema=AuthorSchema,
+                                                        model_get_async=author_store.get_async,
+                                                        model_prime_async=author_store.prime_async)
+    books = [Book(book_id, book_id % 2) for book_id in range(6)]
+    try:
+        document = asyncio.run(JSONAPICollectionSerializer([
+            BookSerializer(book, includes=['author'])
+            for book in books
+        ]).as_json_api_document_async())
+    finally:
+        get_resource_registry_container().unregister('author', ResourceRegistryKeys.MODEL_GET_ASYNC,
+                                                     ResourceRegistryKeys.MODEL_PRIME_ASYNC)
+
+    assert_equal([0, 1], author_store.primed)
+    assert_equal(2, author_store.most_in_flight)
+    assert_equal([], author_store.get_calls)
+    assert_equal([('author', '0'), ('author', '1')],
+                 [(resource['type'], resource['id']) for resource in document['included']])
+
+
+class ThreadedBookSerializer(BookSerializer):
+    pass
+
+
+def test_executor_documents_match_serial_documents():
+    author_store = AuthorStore()
+    register_authors_and_books(author_store, with_get_many=False)
+    books = [Book(book_id, book_id % 3) for book_id in range(9)]
+
+    serial_document = JSONAPICollectionSerializer([
+        BookSerializer(book, includes=['author']) for book in books
+    ]).as_json_api_document()
+    assert_equal({threading.current_thread()}, set(author_store.get_threads))
+
+    author_store.get_threads = []
+    ThreadedBookSerializer.executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        threaded_document = JSONAPICollectionSerializer([
+            ThreadedBookSerializer(book, includes=['author']) for book in books
+        ]).as_json_api_document()
+    finally:
+        ThreadedBookSerializer.executor.shutdown()
+        ThreadedBookSerializer.executor = None
+
+    assert_equal(serial_document, threaded_document)
+    assert_equal(3, len(author_store.get_threads))
+    assert_not_in(threading.current_thread(), author_store.get_threads)
+
+
+class Chapter(object):
+    def __init__(self, chapter_id, book_id):
+        self.chapter_id = chapter_id
+        self.book_id = book_id
+
+
+class ChapterSchema(Schema):
+    SCHEMA = {
+        'type': 'chapter',
+        'id': StringAttribute().read_from(model_property='chapter_id').self_explanatory(),
+        'relationships': {
+            'book': SchemaRelationship(model_type='book', id_attribute='book_id'),
+        }
+    }
+
+
+class ChapterSerializer(SchemaSerializer):
+    @classmethod
+    def schema(cls):
+        return ChapterSchema
+
+
+class StrictBookSerializer(BookSerializer):
+    strict_includes = True
+
+
+def chapters_document(book_serializer):
+    register_authors_and_books(AuthorStore())
+    books = {book_id: Book(book_id, book_id) for book_id in range(2)}
+    registry = get_resource_registry_container()
+    registry.register_resource(type_string='book', schema=BookSchema, serializer=book_serializer, model_get=books.get)
+    try:
+        return JSONAPICollectionSerializer([
+            ChapterSerializer(Chapter(chapter_id, chapter_id % 2), includes=['book'])
+            for chapter_id in range(4)
+        ]).as_json_api_document()
+    finally:
+        registry.register_resource(type_string='book', schema=BookSchema, serializer=BookSerializer)
+        registry.unregister('book', ResourceRegistryKeys.MODEL_GET)
+
+
+def test_strict_includes_stop_default_include_fan_out():
+    reports = []
+    config.suppressed_default_includes_hook = lambda root, count: reports.append(count)
+    try:
+        default_document = chapters_document(BookSerializer)
+        strict_document = chapters_document(StrictBookSerializer)
+    finally:
+        config.suppressed_default_includes_hook = None
+
+    assert_equal(['book', 'book', 'author', 'author'], [resource['type'] for resource in default_document['included']])
+    assert_equal(['book', 'book'], [resource['type'] for resource in strict_document['included']])
+    assert_equal([2], reports)
+
+
+def test_strict_includes_can_be_set_globally():
+    config.strict_includes = True
+    try:
+        document = chapters_document(BookSerializer)
+    finally:
+        config.strict_includes = False
+    assert_equal(['book', 'book'], [resource['type'] for resource in document['included']])
@@ -0,0 +1,53 @@
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cartographer.utils.executors import map_in_executor
+from nose.plugins.skip import SkipTest
+from nose.tools import *
+
+
+def test_results_keep_the_order_of_the_items():
+    finished = []
+    release_first = threading.Event()
+
+    def slow_first(item):
+        if item == 0:
+            release_first.wait(5)
+        finished.append(item)
+        if item == 2:
+            release_first.set()
+        return item * 10
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert_equal([0, 10, 20], map_in_executor(executor, slow_first, range(3)))
+    assert_equal(0, finished[-1])
+
+
+def test_nested_calls_run_inline_instead_of_deadlocking():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        nested = map_in_executor(executor, lambda item: map_in_executor(executor, lambda x: x + item, [1, 2]), [10, 20])
+    assert_equal([[11, 12], [21, 22]], nested)
+
+
+def test_exceptions_are_raised_to_the_caller():
+    def fail_on_one(item):
+        if item == 1:
+            raise KeyError(item)
+        return item
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with assert_raises(KeyError):
+            map_in_executor(executor, fail_on_one, [0, 1, 2])
+
+
+def test_flask_request_context_is_propagated():
+    if importlib.util.find_spec('flask') is None:
+        raise SkipTest('flask is not installed')
+    import flask
+
+    app = flask.Flask(__name__)
+    with app.test_request_context('/?include=author'):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            includes = map_in_executor(executor, lambda _: flask.request.args.get('include'), range(2))
+    assert_equal(['author', 'author'], includes)
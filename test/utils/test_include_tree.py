@@ -0,0 +1,28 @@
+from cartographer.utils.include_tree import IncludeTree, EMPTY_INCLUDE_TREE
+from nose.tools import *
+
+
+def test_from_paths():
+    include_tree = IncludeTree.from_paths(['pledges.campaign.goals', 'campaign', 'pledges.reward'])
+
+    assert_in('pledges', include_tree)
+    assert_in('campaign', include_tree)
+    assert_not_in('goals', include_tree)
+    assert_equal(['campaign', 'reward'], sorted(include_tree.subtree('pledges').keys()))
+    assert_equal(['campaign', 'pledges.campaign.goals', 'pledges.reward'], sorted(include_tree.paths()))
+
+
+def test_subtrees_are_shared():
+    include_tree = IncludeTree.from_paths(['pledges.campaign'])
+
+    assert_is(include_tree.subtree('pledges'), include_tree.subtree('pledges'))
+    assert_is(EMPTY_INCLUDE_TREE, include_tree.subtree('campaign'))
+    assert_false(include_tree.subtree('pledges').subtree('campaign'))
+
+
+def test_from_includes():
+    include_tree = IncludeTree.from_paths(['campaign'])
+
+    assert_is(include_tree, IncludeTree.from_includes(include_tree))
+    assert_is_none(IncludeTree.from_includes(None))
+    assert_false(IncludeTree.from_includes([]))
@@ -0,0 +1,23 @@
+import json
+
+from cartographer.utils.json_encoding import get_json_encoder, set_json_encoder, stdlib_json_encoder
+from nose.tools import *
+
+
+def test_encoders_return_compact_utf8_bytes():
+    json_data = {"name": "café", "tags": [1, 2.5, None, True]}
+    for encoder in [get_json_encoder(), stdlib_json_encoder]:
+        encoded = encoder(json_data)
+        assert_is_instance(encoded, bytes)
+        assert_not_in(b' ', encoded)
+        assert_equal(json_data, json.loads(encoded.decode('utf-8')))
+
+
+def test_set_json_encoder():
+    default_encoder = get_json_encoder()
+    set_json_encoder(stdlib_json_encoder)
+    try:
+        assert_is(stdlib_json_encoder, get_json_encoder())
+    finally:
+        set_json_encoder(None)
+    assert_is(default_encoder, get_json_encoder())
@@ -0,0 +1,44 @@
+import io
+import json
+
+from cartographer.utils.json_stream import JSONStreamReader
+from nose.tools import *
+
+
+def read_document(reader):
+    document = {}
+    for key in reader.iter_object_keys():
+        if key == 'data':
+            document[key] = list(reader.iter_array_items())
+        else:
+            document[key] = reader.read_value()
+    return document
+
+
+def test_documents_are_read_across_chunk_boundaries():
+    document = {
+        'data': [{'id': str(index), 'value': index * 1.5e3, 'text': 'héllo ☃ "quoted"', 'flags': [True, None]}
+                 for index in range(5)],
+        'meta': {'count': 5},
+    }
+    encoded = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+    for chunk_size in range(1, 9):
+        reader = JSONStreamReader(io.BytesIO(encoded), chunk_size=chunk_size)
+        assert_equal(document, read_document(reader))
+        assert_is_none(reader.peek())
+
+
+def test_numbers_are_read_across_chunk_boundaries():
+    for encoded, expected in [(b'[1.5, 2]', [1.5, 2]), (b'[-2.5e10,3E-2,1e+5]', [-2.5e10, 3e-2, 1e5])]:
+        for chunk_size in range(1, 9):
+            reader = JSONStreamReader(io.BytesIO(encoded), chunk_size=chunk_size)
+            assert_equal(expected, list(reader.iter_array_items()))
+    for chunk_size in range(1, 9):
+        reader = JSONStreamReader(io.BytesIO(b'{"a": -2.5e10,"b":1}'), chunk_size=chunk_size)
+        assert_equal({'a': -2.5e10, 'b': 1}, {key: reader.read_value() for key in reader.iter_object_keys()})
+
+
+def test_invalid_documents_raise():
+    for encoded in [b'{"data": [1, 2 3]}', b'{"data": [1,, 2]}', b'{"data" 1}', b'{"data": [tru]}', b'{"data": [1']:
+        reader = JSONStreamReader(io.BytesIO(encoded), chunk_size=3)
+        assert_raises(json.JSONDecodeError, read_document, reader)
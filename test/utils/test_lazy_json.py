@@ -0,0 +1,50 @@
+import json
+
+from cartographer.utils.lazy_json import lazy_json_loads, LazyJSONObject
+from nose.tools import *
+
+
+def test_lazy_documents_decode_to_the_same_values():
+    document = {
+        'data': [{'id': str(index), 'text': 'héllo ☃ "quoted" [x] {y}', 'flags': [True, None, -1.5e3, [], {}]}
+                 for index in range(3)],
+        'meta': {},
+        'escaped': '\\',
+    }
+    for indent in [None, 2]:
+        lazy_document = lazy_json_loads(json.dumps(document, indent=indent, ensure_ascii=False).encode('utf-8'))
+        assert_is_instance(lazy_document, LazyJSONObject)
+        assert_is_instance(lazy_document['data'], list)
+        assert_equal('\\', lazy_document['escaped'])
+        assert_not_in('missing', lazy_document)
+        assert_equal(document, lazy_document)
+
+
+def test_unread_members_are_not_decoded():
+    lazy_document = lazy_json_loads('{"data": {"type": "post"}, "included": [not json]}')
+    assert_equal('post', lazy_document['data']['type'])
+    assert_raises(json.JSONDecodeError, lambda: lazy_document['included'])
+
+
+def test_siblings_before_a_member_are_skipped_without_being_decoded():
+    lazy_document = lazy_json_loads('{"included": [{"id": tru}, {"nested": [1, 2 3]}, "]}"], "data": {"type": "post"}}')
+    assert_equal('post', lazy_document['data']['type'])
+    assert_raises(json.JSONDecodeError, lambda: lazy_document['included'][0]['id'])
+
+
+def test_duplicate_keys_resolve_like_json_loads():
+    raw_json = '{"type": "first", "data": {"id": "1", "id": "2"}, "type": "last", "list": [{"a": 1, "a": 2}]}'
+    lazy_document = lazy_json_loads(raw_json)
+    assert_equal(json.loads(raw_json), lazy_document)
+    assert_equal('last', lazy_document['type'])
+    assert_equal(3, len(lazy_document))
+
+
+def test_deeply_nested_siblings_are_skipped():
+    deep = ['"]}', {'a': [1]}]
+    for _ in range(12):
+        deep = [deep]
+    raw_json = json.dumps({'deep': deep, 'data': {'type': 'post'}})
+    lazy_document = lazy_json_loads(raw_json)
+    assert_equal('post', lazy_document['data']['type'])
+    assert_equal(json.loads(raw_json), lazy_document)
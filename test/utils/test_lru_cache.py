@@ -0,0 +1,36 @@
+from cartographer.utils.lru_cache import LRUCache
+from nose.tools import *
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entries_are_evicted():
+    evicted_keys = []
+    cache = LRUCache(2, on_evict=evicted_keys.append)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert_equal(1, cache.get('a'))
+    assert_is_none(cache.get('b'))
+    assert_equal(3, cache.get('c'))
+    assert_equal(['b'], evicted_keys)
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache = LRUCache(10, ttl_seconds=5, clock=clock)
+    cache.set('a', 1)
+    clock.now = 4
+    assert_in('a', cache)
+
+    clock.now = 5
+    assert_not_in('a', cache)
+    assert_equal(0, len(cache))